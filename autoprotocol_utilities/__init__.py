@@ -1,5 +1,7 @@
-from .container_helpers import volume_check, set_pipettable_volume, plates_needed, sort_well_group, unique_containers, is_columnwise, stamp_shape, first_empty_well, list_of_filled_wells, well_name, container_type_checker, get_well_list_by_cont, next_wells  # NOQA
-from .misc_helpers import user_errors_group, char_limit, printdatetime, printdate, make_list, flatten_list, det_new_group, recursive_search, transfer_properties  # NOQA
-from .resource_helpers import ResourceIDs, oligo_scale_default, return_dispense_media, return_agar_plates, ref_kit_container, oligo_dilution_table  # NOQA
+from .container_helpers import volume_check, set_pipettable_volume, plates_needed, sort_well_group, unique_containers, is_columnwise, stamp_shape, first_empty_well, list_of_filled_wells, well_name, container_type_checker, get_well_list_by_cont, next_wells, normalization_plan, serial_dilution_plan, VolumeLedger, pack_plates, well_mask  # NOQA
+from .misc_helpers import user_errors_group, ErrorCollector, char_limit, sanitize_labels, printdatetime, printdate, make_list, flatten_list, det_new_group, recursive_search, transfer_properties, container_lock, PropertyColumns, SharedProperties, unshare_properties  # NOQA
+from .resource_helpers import ResourceIDs, oligo_scale_default, oligo_scale_batch, return_dispense_media, return_agar_plates, ref_kit_container, ref_kit_containers, oligo_dilution_table, oligo_dilution_volumes, load_catalog, reagent_consumption  # NOQA
 from .thermocycle_helpers import melt_curve, thermocycle_ramp  # NOQA
-from .bio_calculators import dna_mass_to_mole, dna_mole_to_mass, molar_to_mass_conc, mass_conc_to_molar, ligation_insert_ng, ligation_insert_volume, ligation_insert_amount  # NOQA
+from .bio_calculators import dna_mass_to_mole, dna_mole_to_mass, molar_to_mass_conc, mass_conc_to_molar, ligation_insert_ng, ligation_insert_volume, ligation_insert_amount, ligation_plan, MolarRatio, fit_standard_curve, quantify_dna  # NOQA
+from .plate_map import render_plate_map, plate_map_rle  # NOQA
+from .well_set import WellSet  # NOQA
@@ -1,6 +1,74 @@
 from autoprotocol.unit import Unit
+from collections import namedtuple
+import functools
 
 
+# Dimension name to the dimensionality of a reference unit
+_DIMENSIONALITIES = dict(
+    (name, Unit(1, unit).dimensionality) for name, unit in [
+        ("mass", "gram"),
+        ("substance", "mole"),
+        ("volume", "liter"),
+        ("molar", "molar"),
+        ("mass_conc", "gram/liter")])
+# Units (pint UnitsContainer) to dimension name, filled on first use
+_unit_dimensions = {}
+
+
+def _dimension(value):
+    """Return the dimension name of a Unit, None if it is none of the
+    `_DIMENSIONALITIES`. Costs a dict lookup after the first call per unit.
+    """
+    units = value._units
+    try:
+        return _unit_dimensions[units]
+    except KeyError:
+        dimensionality = value.dimensionality
+        name = None
+        for dim_name, dim in _DIMENSIONALITIES.items():
+            if dim == dimensionality:
+                name = dim_name
+        _unit_dimensions[units] = name
+        return name
+
+
+def _check_units(**checks):
+    """Decorator that parses and validates Unit arguments
+
+    Each keyword maps an argument name to a tuple of the allowed dimension
+    names and the error message. String arguments are parsed to Unit and
+    a ValueError with the message is raised if the argument is not a Unit
+    of an allowed dimension.
+    """
+    def decorator(func):
+        code = func.__code__
+        argnames = code.co_varnames[:code.co_argcount]
+        positions = [(argnames.index(name), name, dims, message)
+                     for name, (dims, message) in checks.items()]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            args = list(args)
+            for pos, name, dims, message in positions:
+                if pos < len(args):
+                    args[pos] = _checked_unit(args[pos], dims, message)
+                elif name in kwargs:
+                    kwargs[name] = _checked_unit(kwargs[name], dims, message)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _checked_unit(value, dims, message):
+    if isinstance(value, str):
+        value = Unit.fromstring(value)
+    if not (isinstance(value, Unit) and _dimension(value) in dims):
+        raise ValueError(message)
+    return value
+
+
+@_check_units(mass=(("mass",),
+                    "Mass of DNA must be of type Unit in prefix-gram"))
 def dna_mass_to_mole(length, mass, ds=True):
     """
     For the DNA Length and mass given, return the mole amount of DNA
@@ -42,12 +110,6 @@ def dna_mass_to_mole(length, mass, ds=True):
         If inputs are not of specified types
 
     """
-    if isinstance(mass, str):
-        mass = Unit.fromstring(mass)
-
-    if not isinstance(mass, Unit) or str(mass.dimensionality) != "[mass]":
-        raise ValueError("Mass of DNA must be of type Unit in prefix-gram")
-
     if not isinstance(length, int):
         raise ValueError(
             "Length of DNA is of type %s, must be of type "
@@ -68,6 +130,8 @@ def dna_mass_to_mole(length, mass, ds=True):
     return dna_pmol
 
 
+@_check_units(mole=(("substance",),
+                    "Mole amount of DNA must be of type Unit in prefix-mol"))
 def dna_mole_to_mass(length, mole, ds=True):
     """
     For the DNA Length and mole amount given, return the mass of DNA
@@ -109,13 +173,6 @@ def dna_mole_to_mass(length, mole, ds=True):
         If inputs are not of specified types
 
     """
-    if isinstance(mole, str):
-        mole = Unit.fromstring(mole)
-
-    if not isinstance(mole, Unit) or str(mole.dimensionality) != "[substance]":
-        raise ValueError(
-            "Mole amount of DNA must be of type Unit in prefix-mol")
-
     if not isinstance(length, int):
         raise ValueError(
             "Length of DNA is of type %s, must be of type "
@@ -138,6 +195,8 @@ def dna_mole_to_mass(length, mole, ds=True):
     return dna_ug
 
 
+@_check_units(molar=(("molar",), "Molar concentration of DNA must be of "
+                     "type string or Unit"))
 def molar_to_mass_conc(length, molar, ds=True):
     """
     For the DNA molarity given, return the mass concentration of DNA
@@ -185,14 +244,6 @@ def molar_to_mass_conc(length, molar, ds=True):
             "Length of DNA is of type %s, must be of type "
             "integer" % type(length))
 
-    if isinstance(molar, str):
-        molar = Unit.fromstring(molar)
-
-    if not (isinstance(molar, Unit) and
-            str(molar.dimensionality) == '[substance] / [length] ** 3'):
-        raise ValueError(
-            "Molar concentration of DNA must be of type string or Unit")
-
     if not isinstance(ds, bool):
         raise ValueError(
             "ds is of type %s, must be of type bool: True for dsDNA, "
@@ -205,6 +256,8 @@ def molar_to_mass_conc(length, molar, ds=True):
     return mass_conc
 
 
+@_check_units(mass_conc=(("mass_conc",),
+                         "Mass concentration of DNA must be of type Unit"))
 def mass_conc_to_molar(length, mass_conc, ds=True):
     """
     For the DNA mass concentration given, return the molarity of DNA
@@ -252,13 +305,6 @@ def mass_conc_to_molar(length, mass_conc, ds=True):
             "Length of DNA is of type %s, must be of type "
             "integer" % type(length))
 
-    if isinstance(mass_conc, str):
-        mass_conc = Unit.fromstring(mass_conc)
-
-    if not isinstance(mass_conc, Unit) or \
-            str(mass_conc.dimensionality) != '[mass] / [length] ** 3':
-        raise ValueError("Mass concentration of DNA must be of type Unit")
-
     if not isinstance(ds, bool):
         raise ValueError(
             "ds is of type %s, must be of type bool: True for dsDNA, "
@@ -271,6 +317,112 @@ def mass_conc_to_molar(length, mass_conc, ds=True):
     return dna_molar
 
 
+class MolarRatio(object):
+    """
+    Molar ratio of insert : vector for ligations
+
+    Parses and validates a molar ratio once. Instances are immutable and
+    interned, so `MolarRatio("1:3")` returns the same object every time and
+    the ligation calculators can accept it without parsing again.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import MolarRatio, ligation_insert_ng
+
+        ratio = MolarRatio("1:3")
+        ratio.value
+        ligation_insert_ng(3000, "100:ng", 48, ratio)
+
+    Returns:
+
+    .. code-block:: python
+
+        0.3333333333333333
+        Unit(0.5333333333333333, 'nanogram')
+
+    Parameters
+    ----------
+    molar_ratio : int, float, string, MolarRatio
+        Ratio as a number or a string in the form of int:int
+
+    Attributes
+    ----------
+    insert : float
+        Insert part of the ratio
+    vector : float
+        Vector part of the ratio, 1 for numbers
+    value : float
+        insert / vector
+
+    Raises
+    ------
+    ValueError
+        If molar_ratio is not a number or string in the form of int:int, or
+        is not positive
+
+    """
+
+    __slots__ = ('insert', 'vector', 'value')
+    _cache = {}
+    _cache_size = 1024
+
+    def __new__(cls, molar_ratio):
+        if isinstance(molar_ratio, MolarRatio):
+            return molar_ratio
+        if type(molar_ratio) not in (str, int, float):
+            raise ValueError(
+                "molar_ratio: must be an int, float, or string in the "
+                "form of int:int")
+        key = (type(molar_ratio), molar_ratio)
+        ratio = cls._cache.get(key)
+        if ratio is not None:
+            return ratio
+
+        if isinstance(molar_ratio, str):
+            try:
+                insert, vector = [float(x) for x in molar_ratio.split(":")]
+            except ValueError:
+                raise ValueError(
+                    "molar_ratio: must be an int, float, or string in the "
+                    "form of int:int")
+        else:
+            insert, vector = float(molar_ratio), 1.0
+        if not (insert > 0 and vector > 0):
+            raise ValueError("molar_ratio: %s has to be positive" %
+                             (molar_ratio,))
+
+        ratio = super(MolarRatio, cls).__new__(cls)
+        object.__setattr__(ratio, 'insert', insert)
+        object.__setattr__(ratio, 'vector', vector)
+        object.__setattr__(ratio, 'value', insert / vector)
+        if len(cls._cache) >= cls._cache_size:
+            cls._cache.clear()
+        cls._cache[key] = ratio
+        return ratio
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MolarRatio is immutable")
+
+    def __float__(self):
+        return self.value
+
+    def __eq__(self, other):
+        return isinstance(other, MolarRatio) and self.value == other.value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return "MolarRatio('%g:%g')" % (self.insert, self.vector)
+
+
+@_check_units(plasmid_mass=(("mass",), "Plasmid amount must be of type str "
+                            "or Unit in prefix-g"))
 def ligation_insert_ng(plasmid_size,  plasmid_mass,
                        insert_size, molar_ratio=1):
     """
@@ -306,7 +458,7 @@ def ligation_insert_ng(plasmid_size,  plasmid_mass,
         Length of insert in bp
     plasmid_mass : str, Unit
         Mass of plasmid in prefix-g
-    molar_ratio : int, float, string, optional
+    molar_ratio : int, float, string, MolarRatio, optional
         Ligation molar ratio of insert : vector.  By default it is 1 : 1.
         Generally ligations are tested at 1:3, 1:1, and 3:1
 
@@ -329,22 +481,7 @@ def ligation_insert_ng(plasmid_size,  plasmid_mass,
     if not isinstance(insert_size, int):
         raise ValueError("insert_size: must be an integer")
 
-    if type(molar_ratio) == str:
-        molar_ratio = float(
-            molar_ratio.split(":")[0]) / float(molar_ratio.split(":")[1])
-
-    if type(molar_ratio) not in (int, float):
-        raise ValueError(
-            "molar_ratio: must be an int, float, or string in the form "
-            "of int:int")
-
-    if isinstance(plasmid_mass, str):
-        plasmid_mass = Unit.fromstring(plasmid_mass)
-
-    if not (isinstance(plasmid_mass, Unit) and
-            str(plasmid_mass.dimensionality) == "[mass]"):
-        raise ValueError(
-            "Plasmid amount must be of type str or Unit in prefix-g")
+    molar_ratio = MolarRatio(molar_ratio).value
 
     length_ratio = float(insert_size) / float(plasmid_size)
     plasmid_ng = plasmid_mass.to("ng")
@@ -353,6 +490,11 @@ def ligation_insert_ng(plasmid_size,  plasmid_mass,
     return insert_ng
 
 
+@_check_units(plasmid_mass=(("mass",), "Plasmid mass must be of type str or "
+                            "Unit in prefix-g"),
+              insert_conc=(("molar", "mass_conc"), "Plasmid concentration "
+                           "must be of type Unit in prefix-M or prefix-g / "
+                           "prefix-L "))
 def ligation_insert_volume(plasmid_size,  plasmid_mass, insert_size,
                            insert_conc, ds=True, molar_ratio=1):
     """
@@ -396,7 +538,7 @@ def ligation_insert_volume(plasmid_size,  plasmid_mass, insert_size,
         Molar or mass concentration of insert
     ds: bool, optional
         True for dsDNA, False for ssDNA
-    molar_ratio : int, float, string, optional
+    molar_ratio : int, float, string, MolarRatio, optional
         Ligation molar ratio of insert : vector.
         Common ratios are 1:3, 1:1, and 3:1. 1:1 by default
 
@@ -412,52 +554,26 @@ def ligation_insert_volume(plasmid_size,  plasmid_mass, insert_size,
 
     """
 
-    conc_dimension = ["[substance] / [length] ** 3", '[mass] / [length] ** 3']
-
     # Check input types
     if not isinstance(plasmid_size, int):
         raise ValueError("Plasmid_size: must be an integer")
 
-    if isinstance(plasmid_mass, str):
-        plasmid_mass = Unit.fromstring(plasmid_mass)
-
-    if not isinstance(plasmid_mass, Unit) and \
-            str(plasmid_mass.dimensionality) == "[mass]":
-        raise ValueError(
-            "Plasmid mass must be of type str or Unit in prefix-g")
-
     if not isinstance(insert_size, int):
         raise ValueError("insert_size: must be an integer")
 
-    if isinstance(insert_conc, str):
-        insert_conc = Unit.fromstring(insert_conc)
-
-    if not (isinstance(insert_conc, Unit) and
-            str(insert_conc.dimensionality) in conc_dimension):
-        raise ValueError(
-            "Plasmid concentration must be of type Unit in prefix-M or "
-            "prefix-g / prefix-L ")
-
     if not isinstance(ds, bool):
         raise ValueError(
             "ds is of type %s, must be of type bool: True for dsDNA, "
             "False for ssDNA" % type(ds))
 
-    if type(molar_ratio) == str:
-        molar_ratio = float(
-            molar_ratio.split(":")[0]) / float(molar_ratio.split(":")[1])
-
-    if type(molar_ratio) not in (int, float):
-        raise ValueError(
-            "molar_ratio: must be an int, float, or string in the "
-            "form of int:int")
+    molar_ratio = MolarRatio(molar_ratio).value
 
     len_ratio = float(insert_size) / float(plasmid_size)
     plasmid_ng = plasmid_mass.to("ng")
     insert_ng = plasmid_ng * len_ratio * molar_ratio
 
     # Convert concentration to ng/uL
-    if str(insert_conc.dimensionality) == conc_dimension[0]:
+    if _dimension(insert_conc) == "molar":
         insert_conc = molar_to_mass_conc(insert_size, insert_conc, ds)
 
     else:
@@ -468,6 +584,12 @@ def ligation_insert_volume(plasmid_size,  plasmid_mass, insert_size,
     return insert_vol
 
 
+@_check_units(plasmid_volume=(("volume",), "Volume of plasmid solution must "
+                              "be of type str or Unit"),
+              plasmid_conc=(("molar", "mass_conc"), "Concentration must be "
+                            "of type string or Unit "),
+              insert_conc=(("molar", "mass_conc"), "Concentration must be "
+                           "of type string or Unit "))
 def ligation_insert_amount(plasmid_size, plasmid_conc, plasmid_volume,
                            insert_size, insert_conc, ds=True, molar_ratio=1):
     """
@@ -513,7 +635,7 @@ def ligation_insert_amount(plasmid_size, plasmid_conc, plasmid_volume,
         Molar or mass concentration of insert solution
     ds: bool, optional
         True for dsDNA, False for ssDNA
-    molar_ratio : int, float, string, optional
+    molar_ratio : int, float, string, MolarRatio, optional
         Ligation molar ratio of insert : vector.
         Common ratios are 1:3, 1:1, and 3:1. 1:1 by default
 
@@ -535,43 +657,21 @@ def ligation_insert_amount(plasmid_size, plasmid_conc, plasmid_volume,
     if not isinstance(insert_size, int):
         raise ValueError("insert_size: must be an integer")
 
-    if isinstance(plasmid_volume, str):
-        plasmid_volume = Unit.fromstring(plasmid_volume)
-    if not isinstance(plasmid_volume, Unit) or \
-            str(plasmid_volume.dimensionality) != "[length] ** 3":
-        raise ValueError(
-            "Volume of plasmid solution must be of type str or Unit")
-
-    conc_dimension = ["[substance] / [length] ** 3", '[mass] / [length] ** 3']
     conc = [plasmid_conc, insert_conc]
     size = [plasmid_size, insert_size]
     for i in range(0, 2):
-        if isinstance(conc[i], str):
-            conc[i] = Unit.fromstring(conc[i])
-        if (isinstance(conc[i], Unit) and
-                str(conc[i].dimensionality) in conc_dimension):
-            # Convert all concentrations to ng/uL
-            if str(conc[i].dimensionality) == conc_dimension[0]:
-                conc[i] = molar_to_mass_conc(size[i], conc[i], ds)
-            else:
-                conc[i] = conc[i].to("ng/uL")
+        # Convert all concentrations to ng/uL
+        if _dimension(conc[i]) == "molar":
+            conc[i] = molar_to_mass_conc(size[i], conc[i], ds)
         else:
-            raise ValueError(
-                "Concentration must be of type string or Unit ")
+            conc[i] = conc[i].to("ng/uL")
 
     if not isinstance(ds, bool):
         raise ValueError(
             "ds is of type %s, must be of type bool: True for dsDNA, "
             "False for ssDNA" % type(ds))
 
-    if type(molar_ratio) == str:
-        molar_ratio = float(
-            molar_ratio.split(":")[0]) / float(molar_ratio.split(":")[1])
-
-    if type(molar_ratio) not in (int, float):
-        raise ValueError(
-            "molar_ratio: must be an int, float, or string in the "
-            "form of int:int")
+    molar_ratio = MolarRatio(molar_ratio).value
 
     plasmid_conc = conc[0]
     insert_conc = conc[1]
@@ -583,3 +683,367 @@ def ligation_insert_amount(plasmid_size, plasmid_conc, plasmid_volume,
     insert_amount = insert_ng / insert_conc
 
     return insert_amount
+
+
+# Average molecular weight of one base (pair) in pg/pmol
+_DNA_MW_PER_BP = {True: 660.0, False: 330.0}
+
+LigationPlan = namedtuple('LigationPlan', 'plasmid_size insert_size '
+                          'molar_ratio plasmid_ng insert_ng insert_ul units')
+
+
+def _column(values, rows):
+    if isinstance(values, (list, tuple)):
+        if len(values) != rows:
+            raise ValueError("All columns of a ligation plan must have the "
+                             "same length (%s) or be a single value" % rows)
+        return list(values)
+    return [values] * rows
+
+
+def _quantity(value, dimensions, name):
+    return _checked_unit(value, dimensions, "%s must be of type str, Unit "
+                         "or a number" % name)
+
+
+def _float_column(values, rows, unit, dimensions, name):
+    # Numbers are taken to be in `unit`, each distinct value is parsed once
+    parsed = {}
+    column = []
+    for value in _column(values, rows):
+        if type(value) in (int, float):
+            column.append(float(value))
+            continue
+        key = value if isinstance(value, str) else id(value)
+        if key not in parsed:
+            parsed[key] = float(
+                _quantity(value, dimensions, name).to(unit).magnitude)
+        column.append(parsed[key])
+    return column
+
+
+def _mass_conc_column(values, sizes, ds, name):
+    # Molar or mass concentrations to ng/uL, numbers are taken as ng/uL
+    mw = _DNA_MW_PER_BP[ds]
+    parsed = {}
+    column = []
+    for value, size in zip(_column(values, len(sizes)), sizes):
+        if type(value) in (int, float):
+            column.append(float(value))
+            continue
+        key = value if isinstance(value, str) else id(value)
+        if key not in parsed:
+            conc = _quantity(value, ("molar", "mass_conc"), name)
+            if _dimension(conc) == "molar":
+                parsed[key] = (float(conc.to("uM").magnitude), True)
+            else:
+                parsed[key] = (float(conc.to("ng/uL").magnitude), False)
+        magnitude, molar = parsed[key]
+        if molar:
+            column.append(magnitude * size * mw / 1000.0)
+        else:
+            column.append(magnitude)
+    return column
+
+
+def ligation_plan(plasmid_size, insert_size, plasmid_mass=None,
+                  insert_conc=None, molar_ratio=1, ds=True,
+                  plasmid_conc=None, plasmid_volume=None, ratio_sweep=None):
+    """
+    Compute insert masses and volumes for a whole ligation design
+
+    Vectorized version of `ligation_insert_ng`, `ligation_insert_volume` and
+    `ligation_insert_amount`. Every parameter can be a single value, used
+    for every ligation, or a list with one value per ligation. Units are
+    converted once per distinct value and the math is done on floats.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import ligation_plan
+
+        plan = ligation_plan(3000, [48, 500], plasmid_mass="100:ng",
+                             insert_conc="25:ng/uL",
+                             ratio_sweep=["1:3", "1:1", "3:1"])
+        plan.insert_ng
+        plan.units["insert_ul"]
+
+    Returns:
+
+    .. code-block:: python
+
+        [0.5333333333333333, 1.6, 4.800000000000001, 5.555555555555555,
+         16.666666666666668, 50.0]
+        'microliter'
+
+    Parameters
+    ----------
+    plasmid_size : int, list
+        Length of plasmid in bp.
+    insert_size : int, list
+        Length of insert in bp.
+    plasmid_mass : str, Unit, float, list, optional
+        Mass of plasmid. Numbers are taken as ng. Either plasmid_mass or
+        plasmid_conc and plasmid_volume have to be given.
+    insert_conc : str, Unit, float, list, optional
+        Molar or mass concentration of insert solution. Numbers are taken
+        as ng/uL. If not given, no insert volumes are computed.
+    molar_ratio : int, float, string, MolarRatio, list, optional
+        Ligation molar ratio of insert : vector. 1:1 by default
+    ds : bool, optional
+        True for dsDNA, False for ssDNA
+    plasmid_conc : str, Unit, float, list, optional
+        Molar or mass concentration of plasmid solution. Numbers are taken
+        as ng/uL.
+    plasmid_volume : str, Unit, float, list, optional
+        Volume of plasmid solution. Numbers are taken as uL.
+    ratio_sweep : list, optional
+        Molar ratios to test for every ligation. Each ligation is expanded
+        into one row per ratio (in the given order) and `molar_ratio` is
+        ignored.
+
+    Returns
+    -------
+    LigationPlan: namedtuple
+        Columns `plasmid_size`, `insert_size`, `molar_ratio` (float),
+        `plasmid_ng`, `insert_ng` and `insert_ul` (None per row if no
+        insert_conc was given) as lists, and `units`, a dict with the unit
+        of every quantity column.
+
+    Raises
+    ------
+    ValueError
+        If inputs are not of specified types or columns differ in length
+
+    """
+    if not isinstance(ds, bool):
+        raise ValueError(
+            "ds is of type %s, must be of type bool: True for dsDNA, "
+            "False for ssDNA" % type(ds))
+    if plasmid_mass is None and (plasmid_conc is None or
+                                 plasmid_volume is None):
+        raise ValueError("Either plasmid_mass or plasmid_conc and "
+                         "plasmid_volume have to be given")
+
+    columns = [plasmid_size, insert_size, plasmid_mass, insert_conc,
+               molar_ratio, plasmid_conc, plasmid_volume]
+    rows = max([len(c) for c in columns if isinstance(c, (list, tuple))] or
+               [1])
+    plasmid_size = _column(plasmid_size, rows)
+    insert_size = _column(insert_size, rows)
+    for size in plasmid_size + insert_size:
+        if not isinstance(size, int):
+            raise ValueError("Plasmid and insert sizes must be integers")
+
+    if plasmid_mass is not None:
+        plasmid_ng = _float_column(plasmid_mass, rows, "ng", ("mass",),
+                                   "Plasmid mass")
+    else:
+        plasmid_ul = _float_column(plasmid_volume, rows, "uL",
+                                   ("volume",), "Plasmid volume")
+        plasmid_ng = [c * v for c, v in zip(
+            _mass_conc_column(plasmid_conc, plasmid_size, ds,
+                              "Plasmid concentration"), plasmid_ul)]
+
+    if insert_conc is not None:
+        insert_ng_per_ul = _mass_conc_column(insert_conc, insert_size, ds,
+                                             "Insert concentration")
+    else:
+        insert_ng_per_ul = [None] * rows
+
+    if ratio_sweep is not None:
+        sweep = [MolarRatio(r).value for r in ratio_sweep]
+        expand = len(sweep)
+        ratio_column = sweep * rows
+    else:
+        expand = 1
+        ratio_column = [MolarRatio(r).value
+                        for r in _column(molar_ratio, rows)]
+
+    def expanded(column):
+        return [v for v in column for _ in range(expand)]
+
+    plasmid_size = expanded(plasmid_size)
+    insert_size = expanded(insert_size)
+    plasmid_ng = expanded(plasmid_ng)
+    insert_ng_per_ul = expanded(insert_ng_per_ul)
+
+    insert_ng = [p_ng * float(i_size) / float(p_size) * ratio
+                 for p_ng, i_size, p_size, ratio in zip(
+                     plasmid_ng, insert_size, plasmid_size, ratio_column)]
+    insert_ul = [ng / conc if conc is not None else None
+                 for ng, conc in zip(insert_ng, insert_ng_per_ul)]
+
+    return LigationPlan(plasmid_size=plasmid_size, insert_size=insert_size,
+                        molar_ratio=ratio_column, plasmid_ng=plasmid_ng,
+                        insert_ng=insert_ng, insert_ul=insert_ul,
+                        units={"plasmid_ng": "nanogram",
+                               "insert_ng": "nanogram",
+                               "insert_ul": "microliter"})
+
+
+StandardCurve = namedtuple('StandardCurve', 'slope intercept r_squared')
+DNAQuantification = namedtuple('DNAQuantification', 'mass_conc molar')
+
+
+def fit_standard_curve(concentrations, readings):
+    """
+    Fit a linear standard curve (reading = slope * concentration + intercept)
+
+    Least squares fit for fluorescence based DNA quantification such as
+    Quant-iT PicoGreen, using the readings of a dilution series of a DNA
+    standard.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import fit_standard_curve
+
+        fit_standard_curve([0, 0.5, 1, 2], [10, 510, 1010, 2010])
+
+    Returns:
+
+    .. code-block:: python
+
+        StandardCurve(slope=1000.0, intercept=10.0, r_squared=1.0)
+
+    Parameters
+    ----------
+    concentrations : list
+        Mass concentrations of the standards in ng/uL.
+    readings : list
+        Readings (e.g. fluorescence) of the standards in the same order.
+
+    Returns
+    -------
+    StandardCurve: namedtuple
+        `slope`, `intercept` and `r_squared` of the fit
+
+    Raises
+    ------
+    ValueError
+        If fewer than two standards are given, the lists differ in length or
+        all standards have the same concentration
+
+    """
+    concentrations = [float(c) for c in concentrations]
+    readings = [float(r) for r in readings]
+    n = len(concentrations)
+    if n != len(readings):
+        raise ValueError("Standard curve: concentrations and readings must "
+                         "be of the same length")
+    if n < 2:
+        raise ValueError("Standard curve: at least 2 standards are needed")
+
+    mean_c = sum(concentrations) / n
+    mean_r = sum(readings) / n
+    ss_cc = sum((c - mean_c) ** 2 for c in concentrations)
+    if ss_cc == 0:
+        raise ValueError("Standard curve: standards need different "
+                         "concentrations")
+    ss_cr = sum((c - mean_c) * (r - mean_r)
+                for c, r in zip(concentrations, readings))
+    slope = ss_cr / ss_cc
+    intercept = mean_r - slope * mean_c
+    ss_tot = sum((r - mean_r) ** 2 for r in readings)
+    ss_res = sum((r - (slope * c + intercept)) ** 2
+                 for c, r in zip(concentrations, readings))
+    r_squared = 1.0 - ss_res / ss_tot if ss_tot else 1.0
+
+    return StandardCurve(slope=slope, intercept=intercept,
+                         r_squared=r_squared)
+
+
+def quantify_dna(readings, curve, length, ds=True, dilution_factor=1):
+    """
+    Convert plate readings to DNA mass concentration and molarity
+
+    Applies a standard curve from `fit_standard_curve` to the readings of a
+    whole plate, then converts the mass concentrations to molarity with the
+    formula used by `mass_conc_to_molar`. All math is done on floats.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import fit_standard_curve, quantify_dna
+
+        curve = fit_standard_curve([0, 0.5, 1, 2], [10, 510, 1010, 2010])
+        quantify_dna({0: 340, 5: 1660}, curve, length=5000,
+                     dilution_factor=100)
+
+    Returns:
+
+    .. code-block:: python
+
+        {0: DNAQuantification(mass_conc=33.0, molar=10.0),
+         5: DNAQuantification(mass_conc=165.0, molar=50.0)}
+
+    Parameters
+    ----------
+    readings : list, dict
+        Readings per well. A list is indexed by well index, a dict maps
+        well index to reading. `None` readings are skipped.
+    curve : StandardCurve
+        Standard curve of the readings against ng/uL.
+    length : int, list, dict
+        Length of DNA in bp, for all wells or per well (same form as
+        readings)
+    ds : bool, optional
+        True for dsDNA, False for ssDNA
+    dilution_factor : int, float, optional
+        Dilution of the samples in the read plate. Results are multiplied
+        by this factor.
+
+    Returns
+    -------
+    dict
+        well index as key and a `DNAQuantification` namedtuple with
+        `mass_conc` in ng/uL and `molar` in nM as value
+
+    Raises
+    ------
+    ValueError
+        If inputs are not of specified types
+
+    """
+    if not isinstance(curve, StandardCurve):
+        raise ValueError("curve must be a StandardCurve")
+    if curve.slope == 0:
+        raise ValueError("The standard curve has a slope of 0")
+    if not isinstance(ds, bool):
+        raise ValueError(
+            "ds is of type %s, must be of type bool: True for dsDNA, "
+            "False for ssDNA" % type(ds))
+    if isinstance(readings, dict):
+        items = readings.items()
+    elif isinstance(readings, (list, tuple)):
+        items = enumerate(readings)
+    else:
+        raise ValueError("readings must be a list or a dict")
+
+    if isinstance(length, int):
+        lengths = None
+    elif isinstance(length, (list, tuple, dict)):
+        lengths = length
+    else:
+        raise ValueError(
+            "Length of DNA is of type %s, must be of type "
+            "integer" % type(length))
+
+    # ng/uL per reading unit
+    scale = float(dilution_factor) / curve.slope
+    offset = curve.intercept
+    mw = _DNA_MW_PER_BP[ds]
+
+    results = {}
+    for index, reading in items:
+        if reading is None:
+            continue
+        mass_conc = (reading - offset) * scale
+        bp = length if lengths is None else lengths[index]
+        results[index] = DNAQuantification(
+            mass_conc=mass_conc, molar=mass_conc / (bp * mw) * 10**6)
+    return results
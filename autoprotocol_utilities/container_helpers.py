@@ -1,9 +1,11 @@
 from autoprotocol.container import Container, WellGroup, Well
 from autoprotocol.container_type import _CONTAINER_TYPES
 from autoprotocol.unit import Unit
-from .misc_helpers import flatten_list
+from .misc_helpers import flatten_list, container_lock
 from .rectangle import binary_list, chop_list, max_rectangle, \
     get_quadrant_binary_list, get_well_in_quadrant
+from .well_set import WellSet
+from array import array
 from collections import namedtuple, Counter
 from operator import itemgetter
 import math
@@ -15,7 +17,147 @@ else:
     string_type = basestring
 
 
-def list_of_filled_wells(wells, empty=False):
+ContainerInfo = namedtuple('ContainerInfo',
+                           'shortname well_count rows cols well_volume_ul '
+                           'dead_volume_ul safe_min_volume_ul')
+
+# Container type shortname to (ContainerType, ContainerInfo)
+_container_info_cache = {}
+
+
+def _container_info(container):
+    """Geometry and volumes of a container type with volumes as floats in
+    microliters, computed once per container type shortname."""
+    if isinstance(container, Container):
+        cont_type = container.container_type
+    elif isinstance(container, string_type):
+        cont_type = _CONTAINER_TYPES.get(container)
+        if cont_type is None:
+            return None
+    else:
+        cont_type = container
+    cached = _container_info_cache.get(cont_type.shortname)
+    if cached is not None and cached[0] is cont_type:
+        return cached[1]
+
+    def ul(volume):
+        if volume is None:
+            return 0.0
+        return float(volume.to("microliter").magnitude)
+
+    info = ContainerInfo(
+        shortname=cont_type.shortname,
+        well_count=cont_type.well_count,
+        rows=cont_type.row_count(),
+        cols=cont_type.col_count,
+        well_volume_ul=ul(cont_type.well_volume_ul),
+        dead_volume_ul=ul(cont_type.dead_volume_ul),
+        safe_min_volume_ul=ul(cont_type.safe_min_volume_ul))
+    if cont_type.shortname is not None:
+        _container_info_cache[cont_type.shortname] = (cont_type, info)
+    return info
+
+
+# (shortname, edges, rows, columns) to exclusion bitmask
+_well_mask_cache = {}
+
+
+def well_mask(container, edges=False, rows=None, columns=None, wells=None):
+    """Build a bitmask of wells to exclude for a container type
+
+    Bit `i` of the mask is set if well index `i` is excluded. Masks for
+    edges, rows and columns are computed once per container type and
+    reused. The mask can be passed as `exclude` to `next_wells`,
+    `first_empty_well` and `list_of_filled_wells`.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import well_mask, next_wells
+
+        p = Protocol()
+        plate = p.ref("plate", None, "96-flat", discard=True)
+        mask = well_mask(plate, edges=True, columns=[10])
+        assay_wells = next_wells(plate, num=8, exclude=mask)
+        next(assay_wells)
+
+    Returns:
+
+    .. code-block:: python
+
+        [
+            Well(Container(plate), 13, None),
+            Well(Container(plate), 14, None),
+            Well(Container(plate), 15, None),
+            Well(Container(plate), 16, None),
+            Well(Container(plate), 17, None),
+            Well(Container(plate), 18, None),
+            Well(Container(plate), 19, None),
+            Well(Container(plate), 20, None)
+        ]
+
+    Parameters
+    ----------
+    container: Container, ContainerType, str
+        Container, container type or container type shortname
+    edges: bool, optional
+        Exclude the outer rows and columns (e.g. against evaporation)
+    rows: list, optional
+        Indices of rows to exclude
+    columns: list, optional
+        Indices of columns to exclude (e.g. control columns)
+    wells: list, optional
+        Indices of single wells to exclude
+
+    Returns
+    -------
+    int
+        Bitmask of the excluded wells
+
+    Raises
+    ------
+    ValueError
+        If the container type is unknown
+
+    """
+    info = _container_info(container)
+    if info is None:
+        raise ValueError("well_mask: unknown container type %s" % container)
+    rows = tuple(sorted(set(rows or [])))
+    columns = tuple(sorted(set(columns or [])))
+    key = (info.shortname, bool(edges), rows, columns)
+    mask = _well_mask_cache.get(key) if info.shortname else None
+    if mask is None:
+        mask = 0
+        last_row = info.rows - 1
+        last_col = info.cols - 1
+        for index in range(info.well_count):
+            row, col = divmod(index, info.cols)
+            if (row in rows or col in columns or
+                    (edges and (row in (0, last_row) or
+                                col in (0, last_col)))):
+                mask |= 1 << index
+        if info.shortname:
+            _well_mask_cache[key] = mask
+    for index in wells or []:
+        mask |= 1 << index
+    return mask
+
+
+def _exclusion(exclude):
+    if exclude is None:
+        return 0
+    if isinstance(exclude, int):
+        return exclude
+    mask = 0
+    for index in exclude:
+        mask |= 1 << index
+    return mask
+
+
+def list_of_filled_wells(wells, empty=False, exclude=None):
     """
     For the container given, determine which wells are filled
 
@@ -25,6 +167,8 @@ def list_of_filled_wells(wells, empty=False):
         Takes a container (uses all wells), a WellGroup or a List of wells
     empty : bool
         If True return empty wells instead of filled
+    exclude : int, list, optional
+        Bitmask from `well_mask` or list of well indices to skip
 
     Returns
     -------
@@ -41,8 +185,11 @@ def list_of_filled_wells(wells, empty=False):
     if isinstance(wells, Container):
         wells = wells.all_wells()
 
+    mask = _exclusion(exclude)
     return_wells = []
     for well in wells:
+        if mask >> well.index & 1:
+            continue
         if not empty:
             if well.volume is not None:
                 return_wells.append(well)
@@ -52,7 +199,7 @@ def list_of_filled_wells(wells, empty=False):
     return return_wells
 
 
-def first_empty_well(wells, return_index=True):
+def first_empty_well(wells, return_index=True, exclude=None):
     """
     Get the first empty well of a container followed by only empty wells
 
@@ -63,6 +210,8 @@ def first_empty_well(wells, return_index=True):
     return_index : bool, optional
         Default true, if true returns the index of the well, if false the
         well itself.
+    exclude : int, list, optional
+        Bitmask from `well_mask` or list of well indices to skip
 
     Returns
     -------
@@ -85,6 +234,11 @@ def first_empty_well(wells, return_index=True):
     else:
         assert len(unique_containers(wells)) == 1
         wells = list(sort_well_group(wells))
+    mask = _exclusion(exclude)
+    if mask:
+        wells = [w for w in wells if not mask >> w.index & 1]
+        if not wells:
+            return None
 
     last_well = max(wells, key=lambda x: x.index if x.volume else 0)
     next_index = wells.index(last_well) + 1
@@ -324,9 +478,10 @@ def stamp_shape(wells, full=True, quad=False):
 
     Parameters
     ----------
-    wells: Container, WellGroup, list
+    wells: Container, WellGroup, list, WellSet
         If Container - all filled wells will be used to determine the shape.
-        If list of wells or well_group all provided wells will be analyzed.
+        If list of wells, well_group or WellSet all provided wells will be
+        analyzed.
     full: bool, optional
         If true will only return shapes that span either the full rows or
         columns of the container.
@@ -363,6 +518,9 @@ def stamp_shape(wells, full=True, quad=False):
     if isinstance(wells, Container):
         cont = wells
         wells = list_of_filled_wells(wells)
+    elif isinstance(wells, WellSet):
+        cont = wells.container
+        wells = list(wells.wells())
     elif isinstance(wells, (list, WellGroup)):
         assert len(unique_containers(wells)) == 1, "Stamp_shape: wells have "
         "to come from one container"
@@ -411,9 +569,10 @@ def stamp_shape(wells, full=True, quad=False):
 
     stamp_shape = namedtuple(
         'Stamp', 'start_well shape remaining_wells included_wells')
-    rows = cont.container_type.row_count()
-    cols = cont.container_type.col_count
-    well_count = cont.container_type.well_count
+    info = _container_info(cont)
+    rows = info.rows
+    cols = info.cols
+    well_count = info.well_count
     indices = [x.index for x in wells]
 
     if well_count not in (96, 384):
@@ -423,7 +582,7 @@ def stamp_shape(wells, full=True, quad=False):
                             included_wells=[])
         return [shape]
 
-    bnry_list = [bnry for bnry in binary_list(indices, length=well_count)]
+    bnry_list = list(binary_list(indices, length=well_count))
     if well_count == 384 and quad:
         bnry_list_list = get_quadrant_binary_list(bnry_list)
         temp_shape = []
@@ -546,7 +705,7 @@ def is_columnwise(wells):
     cont = unique_containers(wells)[0]
 
     all_wells = list(cont.all_wells(columnwise=True))
-    top_wells = list(cont.wells_from(0, cont.container_type.col_count))
+    top_wells = list(cont.wells_from(0, _container_info(cont).cols))
     wells = sort_well_group(wells, columnwise=True)
 
     if wells[0] in top_wells:
@@ -601,9 +760,9 @@ def plates_needed(wells_needed, wells_available):
     if not isinstance(wells_needed, (float, int)):
         raise RuntimeError("wells_needed has to be an int or a float")
     if isinstance(wells_available, Container):
-        wells_available = float(wells_available.container_type.well_count)
+        wells_available = float(_container_info(wells_available).well_count)
     elif isinstance(wells_available, string_type):
-        cont = _CONTAINER_TYPES.get(wells_available, None)
+        cont = _container_info(wells_available)
         if cont:
             wells_available = float(cont.well_count)
         else:
@@ -619,6 +778,168 @@ def plates_needed(wells_needed, wells_available):
     return int(math.ceil(wells_needed / wells_available))
 
 
+BlockPlacement = namedtuple('BlockPlacement', 'plate wells')
+PlateLayout = namedtuple('PlateLayout', 'container_type plates layout')
+
+
+def _pack(blocks, info, blocked):
+    full = (1 << info.well_count) - 1
+    plates = []
+    placements = [None] * len(blocks)
+
+    # largest rectangles first, then single wells into the gaps
+    order = sorted(
+        (i for i, b in enumerate(blocks) if not isinstance(b, int)),
+        key=lambda i: -(blocks[i][0] * blocks[i][1]))
+    shapes = {}
+    first_fit = {}
+    for i in order:
+        rows, cols = blocks[i]
+        if (rows, cols) not in shapes:
+            if rows > info.rows or cols > info.cols:
+                return None
+            row_mask = (1 << cols) - 1
+            shape = 0
+            for r in range(rows):
+                shape |= row_mask << (r * info.cols)
+            origins = [y * info.cols + x
+                       for y in range(info.rows - rows + 1)
+                       for x in range(info.cols - cols + 1)
+                       if not (shape << (y * info.cols + x)) & blocked]
+            if not origins:
+                return None
+            shapes[(rows, cols)] = (shape, origins)
+        shape, origins = shapes[(rows, cols)]
+        # plates only fill up, so a position where a shape did not fit
+        # before is never tried again
+        plate, pos = first_fit.get((rows, cols), (0, 0))
+        while True:
+            if plate == len(plates):
+                plates.append(blocked)
+            used = plates[plate]
+            while pos < len(origins) and (shape << origins[pos]) & used:
+                pos += 1
+            if pos < len(origins):
+                break
+            plate += 1
+            pos = 0
+        fit = origins[pos]
+        first_fit[(rows, cols)] = (plate, pos)
+        plates[plate] |= shape << fit
+        placements[i] = BlockPlacement(plate, [
+            fit + r * info.cols + c for r in range(rows)
+            for c in range(cols)])
+
+    if full & ~blocked == 0 and any(isinstance(b, int) for b in blocks):
+        return None
+    plate = 0
+    for i, block in enumerate(blocks):
+        if not isinstance(block, int):
+            continue
+        wells = []
+        while len(wells) < block:
+            if plate == len(plates):
+                plates.append(blocked)
+            free = full & ~plates[plate]
+            while free and len(wells) < block:
+                low = free & -free
+                index = low.bit_length() - 1
+                wells.append((plate, index))
+                plates[plate] |= low
+                free ^= low
+            if not free:
+                plate += 1
+        placements[i] = [BlockPlacement(p, [w for q, w in wells if q == p])
+                         for p in sorted(set(q for q, w in wells))]
+    return len(plates), placements
+
+
+def pack_plates(blocks, container_types, reserved=None, exclude_edges=False):
+    """Pack sample blocks onto as few plates as possible
+
+    Unlike `plates_needed`, which only divides the number of wells, this
+    models the layout: rectangular blocks (e.g. a dilution series or a
+    stamp) have to stay contiguous on one plate, reserved wells (e.g.
+    controls) and edge wells can be kept free on every plate. Blocks are
+    placed first-fit-decreasing on bitmaps of the plates, single wells
+    fill the remaining gaps.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import pack_plates
+
+        layout = pack_plates([(8, 6), (8, 6), (8, 6), 10],
+                             ["96-flat", "384-flat"], reserved=[95])
+        layout.container_type, layout.plates, layout.layout[2]
+
+    Returns:
+
+    .. code-block:: python
+
+        ('384-flat', 1, BlockPlacement(plate=0, wells=[12, 13, ..., 185]))
+
+    Parameters
+    ----------
+    blocks: list
+        Sample groups. An int is a number of samples that can go in any
+        wells, a (rows, columns) tuple is a block that has to be placed as
+        one rectangle.
+    container_types: str, list
+        Container type shortname(s) to pack into. The type needing the
+        fewest plates wins, the first listed wins ties.
+    reserved: list, optional
+        Well indices to keep free on every plate
+    exclude_edges: bool, optional
+        Keep the outer rows and columns of every plate free
+
+    Returns
+    -------
+    PlateLayout: namedtuple
+        `container_type` shortname, number of `plates` and the `layout`:
+        a list with one entry per block in the order of `blocks`. Blocks
+        get a `BlockPlacement` of the plate number and the well indices;
+        ints get a list of `BlockPlacement`, one per plate used.
+
+    Raises
+    ------
+    ValueError
+        If a container type is unknown
+    ValueError
+        If a block does not fit into any of the container types
+
+    """
+    if isinstance(container_types, string_type):
+        container_types = [container_types]
+    for block in blocks:
+        if isinstance(block, int):
+            assert block >= 0, "pack_plates: sample counts must be positive"
+        else:
+            assert len(block) == 2 and block[0] > 0 and block[1] > 0, (
+                "pack_plates: blocks must be ints or (rows, columns) tuples")
+
+    best = None
+    for shortname in container_types:
+        info = _container_info(shortname)
+        if info is None:
+            raise ValueError("pack_plates: unknown container type %s" %
+                             shortname)
+        blocked = 0
+        for index in reserved or []:
+            blocked |= 1 << index
+        if exclude_edges:
+            blocked |= well_mask(shortname, edges=True)
+        packed = _pack(list(blocks), info, blocked)
+        if packed is not None and (best is None or packed[0] < best.plates):
+            best = PlateLayout(container_type=shortname, plates=packed[0],
+                               layout=packed[1])
+    if best is None:
+        raise ValueError("pack_plates: blocks do not fit into any of the "
+                         "container types %s" % ", ".join(container_types))
+    return best
+
+
 def set_pipettable_volume(well, use_safe_vol=False):
     """Remove dead volume from pipettable volume.
 
@@ -653,11 +974,12 @@ def set_pipettable_volume(well, use_safe_vol=False):
         cont[well.container] = [well]
 
     for c, w in cont.items():
-        correction_vol = c.container_type.dead_volume_ul
-        if use_safe_vol:
-            correction_vol = c.container_type.safe_min_volume_ul
-        for x in w:
-            x.set_volume(x.volume - correction_vol)
+        info = _container_info(c)
+        correction_vol = Unit(info.safe_min_volume_ul if use_safe_vol else
+                              info.dead_volume_ul, "microliter")
+        with container_lock(c):
+            for x in w:
+                x.set_volume(x.volume - correction_vol)
 
     return well
 
@@ -725,39 +1047,39 @@ def volume_check(well, usage_volume=0, use_safe_vol=False,
     assert isinstance(well, (Well, WellGroup, list))
     if isinstance(well, Well):
         well = [well]
+    if isinstance(usage_volume, (int, float)):
+        usage_volume = Unit(usage_volume, "microliter")
+    if isinstance(usage_volume, string_type):
+        usage_volume = Unit.fromstring(usage_volume)
+    usage_ul = _microliters(usage_volume)
 
     error_message = []
     # noinspection PyTypeChecker
     for aliquot in well:
         assert isinstance(aliquot, Well)
-        if isinstance(usage_volume, (int, float)):
-            usage_volume = Unit(usage_volume, "microliter")
-        if isinstance(usage_volume, string_type):
-            usage_volume = int(usage_volume.split(":microliter")[0])
         if not aliquot.volume:
             error_message.append(
                 "Your aliquot does not have a volume. (%s) We assume 0 uL "
                 "for this test." % aliquot)
 
-        correction_vol = aliquot.container.container_type.dead_volume_ul
+        info = _container_info(aliquot.container)
+        correction_ul = info.dead_volume_ul
         message_string = "dead volume"
-        volume = Unit(0, "microliter")
+        volume_ul = 0.0
         if aliquot.volume:
-            volume = aliquot.volume
+            volume_ul = _microliters(aliquot.volume)
         if use_safe_vol:
-            correction_vol = \
-                aliquot.container.container_type.safe_min_volume_ul
+            correction_ul = info.safe_min_volume_ul
             message_string = "safe minimum volume"
         elif use_safe_dead_diff:
-            correction_vol = \
-                aliquot.container.container_type.safe_min_volume_ul - \
-                aliquot.container.container_type.dead_volume_ul
+            correction_ul = info.safe_min_volume_ul - info.dead_volume_ul
             message_string = "safe minimum volume"
-            volume = volume + aliquot.container.container_type.dead_volume_ul
-        test_vol = correction_vol + usage_volume
+            volume_ul = volume_ul + info.dead_volume_ul
 
-        if test_vol > volume:
-            if usage_volume == 0:
+        if correction_ul + usage_ul > volume_ul:
+            correction_vol = Unit(correction_ul, "microliter")
+            volume = Unit(volume_ul, "microliter")
+            if usage_ul == 0:
                 error_message.append(
                     "You want to pipette from a container with {:~P} {!s}. "
                     "However, your aliquot: {!s}, only has {:~P}.".format(
@@ -883,10 +1205,10 @@ def container_type_checker(containers, shortname, exclude=False):
 
     for cont in containers:
         if exclude:
-            if cont.container_type.shortname in shortname:
+            if _container_info(cont).shortname in shortname:
                 error_containers.append(str(cont))
         else:
-            if cont.container_type.shortname not in shortname:
+            if _container_info(cont).shortname not in shortname:
                 error_containers.append(str(cont))
 
     if error_containers:
@@ -975,7 +1297,7 @@ def get_well_list_by_cont(wells):
     return well_map
 
 
-def next_wells(target, num=1, columnwise=False):
+def next_wells(target, num=1, columnwise=False, exclude=None):
     '''
     Given a plate, a list of plates or a WellGroup, returns a generator
     function that can be used to iterate through the (container's) wells.
@@ -1023,6 +1345,9 @@ def next_wells(target, num=1, columnwise=False):
         Set to True if wells should be generated in columnwise
         format. Defaults to False. If a WellGroup is given this parameter is
         ignored.
+    exclude: int, list, optional
+        Bitmask from `well_mask` or list of well indices to skip. Applies
+        to the well indices of every container.
 
     Returns
     -------
@@ -1040,21 +1365,519 @@ def next_wells(target, num=1, columnwise=False):
     StopIteration
         If all wells have been used
     '''
-    next_index = 0
     assert isinstance(target, (list, Container, WellGroup)), (
         "target must be a Container or a list of Containers or WellGroup")
 
-    well_list = []
     if isinstance(target, Container):
-        well_list.extend(target.all_wells(columnwise=columnwise))
-    if isinstance(target, list):
+        sources = [target.all_wells(columnwise=columnwise)]
+    elif isinstance(target, list):
         for p in target:
             assert isinstance(p, Container), ("all elements of `target` "
                                               "must be Containers")
-        for t in target:
-            well_list.extend(t.all_wells(columnwise=columnwise))
-    elif isinstance(target, WellGroup):
-        well_list = list(target)
-    while next_index <= len(well_list) - num:
-        yield well_list[next_index:(next_index + num)]
-        next_index += num
+        sources = (t.all_wells(columnwise=columnwise) for t in target)
+    else:
+        sources = [target]
+    mask = _exclusion(exclude)
+
+    group = []
+    for wells in sources:
+        for well in wells:
+            if mask >> well.index & 1:
+                continue
+            group.append(well)
+            if len(group) == num:
+                yield group
+                group = []
+
+
+NormalizationTransfer = namedtuple('NormalizationTransfer',
+                                   'source destination volume')
+NormalizationPlan = namedtuple('NormalizationPlan',
+                               'diluent sample errors')
+
+
+def _microliters(volume):
+    if isinstance(volume, (int, float)):
+        return float(volume)
+    return float(Unit.fromstring(volume).to("microliter").magnitude)
+
+
+def _magnitude(value, unit):
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = Unit.fromstring(value)
+    if unit is None:
+        return float(value.magnitude)
+    return float(value.to(unit).magnitude)
+
+
+def _source_volume_errors(transfers, use_safe_vol=False):
+    # sources can be used more than once, so check the summed usage
+    usage = {}
+    sources = []
+    for t in transfers:
+        if t.source not in usage:
+            usage[t.source] = 0
+            sources.append(t.source)
+        usage[t.source] += t.volume
+    errors = []
+    for src in sources:
+        info = _container_info(src.container)
+        dead = info.safe_min_volume_ul if use_safe_vol else info.dead_volume_ul
+        available = _microliters(src.volume) if src.volume else 0.0
+        if usage[src] + dead > available:
+            errors.append(
+                "%s: %.3f uL are needed above %.3f uL %s, but the well only "
+                "has %.3f uL" % (
+                    well_name(src), usage[src], dead,
+                    "safe minimum volume" if use_safe_vol else "dead volume",
+                    available))
+    return errors
+
+
+def normalization_plan(wells, concentrations, target_conc, final_volume,
+                       destinations, min_volume=0, use_safe_vol=False):
+    """Plan transfers that normalize samples to one concentration
+
+    Computes sample and diluent volumes for all wells in one pass and checks
+    that every source well holds the volume it has to give above the dead
+    volume (or safe minimum volume) of its container. Diluent transfers are
+    listed first, so they can be done with a single tip into the empty
+    destinations, followed by one sample transfer per destination.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import normalization_plan
+
+        p = Protocol()
+        src = p.ref("src", None, "96-pcr", discard=True)
+        dest = p.ref("dest", None, "96-pcr", discard=True)
+        src.wells_from(0, 3).set_volume("30:microliter")
+
+        plan = normalization_plan(src.wells_from(0, 3), [50, 20, 10],
+                                  "10:nanomolar", "20:microliter",
+                                  dest.wells_from(0, 3))
+        plan.sample
+
+    Returns:
+
+    .. code-block:: python
+
+        [
+            NormalizationTransfer(
+                source=Well(Container(src), 0, 30.0:microliter),
+                destination=Well(Container(dest), 0, None), volume=4.0),
+            NormalizationTransfer(
+                source=Well(Container(src), 1, 30.0:microliter),
+                destination=Well(Container(dest), 1, None), volume=10.0),
+            NormalizationTransfer(
+                source=Well(Container(src), 2, 30.0:microliter),
+                destination=Well(Container(dest), 2, None), volume=20.0)
+        ]
+
+    Parameters
+    ----------
+    wells : list, WellGroup
+        Source wells with the samples to normalize
+    concentrations : list, dict
+        Concentration of every source well, as a list in the order of
+        `wells` or as a dict with the well index as key. Numbers are taken
+        to be in the unit of `target_conc`, Units are converted.
+    target_conc : Unit, str, int, float
+        Concentration to normalize to
+    final_volume : Unit, str, int, float
+        Volume of every normalized sample. Numbers are taken as microliter.
+    destinations : list, WellGroup
+        One destination well per source well
+    min_volume : Unit, str, int, float, optional
+        Smallest volume that can be pipetted. Sample volumes below it are
+        reported as errors.
+    use_safe_vol : bool, optional
+        Check source wells against the safe minimum volume instead of the
+        dead volume of their container
+
+    Returns
+    -------
+    NormalizationPlan: namedtuple
+        `diluent`: list of NormalizationTransfer with `source` None for
+        diluent additions, skipping wells that need no diluent.
+        `sample`: list of NormalizationTransfer from source to destination.
+        `errors`: list of strings, empty if the plan can be executed. All
+        volumes are floats in microliters.
+
+    Raises
+    ------
+    ValueError
+        If wells or destinations are not lists of Wells or differ in length
+    ValueError
+        If the number of concentrations does not match the number of wells
+
+    """
+    assert isinstance(wells, (list, WellGroup)), (
+        "normalization_plan: wells must be a list or a WellGroup")
+    assert isinstance(destinations, (list, WellGroup)), (
+        "normalization_plan: destinations must be a list or a WellGroup")
+    wells = list(wells)
+    destinations = list(destinations)
+    for well in wells + destinations:
+        assert isinstance(well, Well), (
+            "normalization_plan: wells and destinations must be Wells")
+    assert len(wells) == len(destinations), (
+        "normalization_plan: one destination is needed per source well")
+
+    if isinstance(concentrations, dict):
+        concentrations = [concentrations[w.index] for w in wells]
+    assert len(concentrations) == len(wells), (
+        "normalization_plan: one concentration is needed per source well")
+
+    if isinstance(target_conc, (int, float)):
+        target_unit = None
+        target = float(target_conc)
+    else:
+        target_conc = Unit.fromstring(target_conc)
+        target_unit = target_conc.unit
+        target = float(target_conc.magnitude)
+    assert target > 0, "normalization_plan: target_conc must be positive"
+    final = _microliters(final_volume)
+    minimum = _microliters(min_volume)
+
+    # dilution factor for every well, then volumes from it
+    concs = [_magnitude(c, target_unit) for c in concentrations]
+    sample_vols = [final * target / c if c > 0 else float("inf")
+                   for c in concs]
+
+    diluent = []
+    sample = []
+    errors = []
+    for src, dest, conc, vol in zip(wells, destinations, concs,
+                                    sample_vols):
+        if vol > final:
+            errors.append(
+                "%s: concentration %s is below the target concentration %s" %
+                (well_name(src), conc, target))
+            continue
+        if vol < minimum:
+            errors.append(
+                "%s: sample volume %.3f uL is below the minimum volume of "
+                "%.3f uL" % (well_name(src), vol, minimum))
+            continue
+        if final - vol > 0:
+            diluent.append(NormalizationTransfer(None, dest, final - vol))
+        sample.append(NormalizationTransfer(src, dest, vol))
+
+    errors.extend(_source_volume_errors(sample, use_safe_vol))
+
+    return NormalizationPlan(diluent=diluent, sample=sample, errors=errors)
+
+
+SerialDilutionPlan = namedtuple('SerialDilutionPlan',
+                                'series columnwise stock_volume '
+                                'diluent_volume transfer_volume transfers '
+                                'errors')
+
+
+def serial_dilution_plan(target, series, points, dilution_factor,
+                         final_volume, columnwise=False, sources=None,
+                         use_safe_vol=False):
+    """Lay out serial dilutions and compute all of their volumes
+
+    Takes `points` consecutive wells per series from `target` with
+    `next_wells` and computes the volumes of all series at once. Every well
+    of a series receives `final_volume` of diluent, except the first well,
+    which receives the stock. The first well then gets `final_volume` plus
+    the transfer volume of stock, so all wells end up with `final_volume`
+    after the serial transfers, except the last well, which keeps the last
+    transfer volume on top.
+
+    Transfers are grouped by step: step `k` moves the transfer volume from
+    point `k` to point `k + 1` in every series, so a step can be pipetted
+    with a multichannel head when the series are laid out in parallel.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import serial_dilution_plan
+
+        p = Protocol()
+        plate = p.ref("dose_response", None, "96-flat", discard=True)
+
+        plan = serial_dilution_plan(plate, series=8, points=12,
+                                    dilution_factor=3,
+                                    final_volume="100:microliter")
+        plan.series[0][0], plan.series[0][-1], plan.transfer_volume
+
+    Returns:
+
+    .. code-block:: python
+
+        (Well(Container(dose_response), 0, None),
+         Well(Container(dose_response), 11, None),
+         [50.0, 50.0, 50.0, 50.0, 50.0, 50.0, 50.0, 50.0])
+
+    Parameters
+    ----------
+    target : Container, list, WellGroup
+        Container(s) or wells to lay the series out in, as accepted by
+        `next_wells`
+    series : int
+        Number of dilution series
+    points : int
+        Number of wells per series
+    dilution_factor : int, float, list
+        Fold dilution per step, for all series or one per series
+    final_volume : Unit, str, int, float
+        Volume of every dilution well. Numbers are taken as microliter.
+    columnwise : bool, optional
+        Lay every series out down a column instead of along a row. Ignored
+        if `target` is a WellGroup.
+    sources : list, WellGroup, optional
+        One stock well per series. If given, stock transfers are added as
+        step 0 and the stock wells are checked for enough volume.
+    use_safe_vol : bool, optional
+        Check stock wells against the safe minimum volume instead of the
+        dead volume of their container
+
+    Returns
+    -------
+    SerialDilutionPlan: namedtuple
+        `series`: list of WellGroups, one per series.
+        `columnwise`: whether the series were laid out columnwise.
+        `stock_volume`, `diluent_volume`, `transfer_volume`: lists with one
+        float in microliters per series.
+        `transfers`: list of steps, each a list of NormalizationTransfer.
+        `errors`: list of strings, empty if the plan can be executed.
+
+    Raises
+    ------
+    ValueError
+        If series or points are not positive integers
+    ValueError
+        If a dilution factor is not larger than 1
+    ValueError
+        If the number of sources or dilution factors does not match series
+
+    """
+    assert isinstance(series, int) and series > 0, (
+        "serial_dilution_plan: series must be a positive integer")
+    assert isinstance(points, int) and points > 1, (
+        "serial_dilution_plan: points must be an integer larger than 1")
+    if isinstance(dilution_factor, (list, tuple)):
+        factors = [float(f) for f in dilution_factor]
+        assert len(factors) == series, (
+            "serial_dilution_plan: one dilution factor is needed per series")
+    else:
+        factors = [float(dilution_factor)] * series
+    for f in factors:
+        assert f > 1, (
+            "serial_dilution_plan: dilution factors must be larger than 1")
+    if sources is not None:
+        sources = list(sources)
+        assert len(sources) == series, (
+            "serial_dilution_plan: one source is needed per series")
+        for well in sources:
+            assert isinstance(well, Well), (
+                "serial_dilution_plan: sources must be Wells")
+
+    errors = []
+    if isinstance(target, WellGroup):
+        columnwise = is_columnwise(target) is True
+    layout = []
+    for wells in next_wells(target, num=points, columnwise=columnwise):
+        layout.append(WellGroup(wells))
+        if len(layout) == series:
+            break
+    if len(layout) < series:
+        errors.append("serial_dilution_plan: only %s of %s series fit into "
+                      "the target" % (len(layout), series))
+
+    final = _microliters(final_volume)
+    transfer_vols = [final / (f - 1) for f in factors]
+    stock_vols = [final + t for t in transfer_vols]
+    diluent_vols = [final] * series
+
+    transfers = []
+    if sources is not None:
+        transfers.append([NormalizationTransfer(src, wells[0], vol)
+                          for src, wells, vol in
+                          zip(sources, layout, stock_vols)])
+        errors.extend(_source_volume_errors(transfers[0], use_safe_vol))
+    for step in range(points - 1):
+        transfers.append([NormalizationTransfer(wells[step], wells[step + 1],
+                                                vol)
+                          for wells, vol in zip(layout, transfer_vols)])
+
+    for wells, stock, transfer in zip(layout, stock_vols, transfer_vols):
+        capacity = _container_info(wells[0].container).well_volume_ul
+        peak = max(stock, final + transfer)
+        if peak > capacity:
+            errors.append(
+                "%s: %.3f uL exceed the well volume of %.3f uL" % (
+                    well_name(wells[0]), peak, capacity))
+
+    return SerialDilutionPlan(series=layout, columnwise=columnwise,
+                              stock_volume=stock_vols,
+                              diluent_volume=diluent_vols,
+                              transfer_volume=transfer_vols,
+                              transfers=transfers, errors=errors)
+
+
+VolumeShortfall = namedtuple('VolumeShortfall',
+                             'safe_min_volume dead_volume')
+
+
+class VolumeLedger(object):
+    """Simulate the volumes of wells over many planned transfers
+
+    Records planned transfers as (source, destination, microliter) rows and
+    replays them in order on top of the current well volumes. The replay
+    keeps a running sum of every well's volume, so it finds the first
+    instruction at which a source drops below the safe minimum or dead
+    volume of its container without touching the `Well` objects.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import VolumeLedger
+
+        p = Protocol()
+        src = p.ref("src", None, "96-pcr", discard=True)
+        dest = p.ref("dest", None, "96-pcr", discard=True)
+        src.well(0).set_volume("27:microliter")
+
+        ledger = VolumeLedger()
+        for well in dest.wells_from(0, 8):
+            ledger.add(src.well(0), well, "4:microliter")
+        ledger.replay()
+
+    Returns:
+
+    .. code-block:: python
+
+        {Well(Container(src), 0, 27.0:microliter):
+            VolumeShortfall(safe_min_volume=5, dead_volume=6)}
+
+    """
+
+    def __init__(self):
+        self._wells = []
+        self._ids = {}
+        self._src = array('l')
+        self._dst = array('l')
+        self._vol = array('d')
+
+    def __len__(self):
+        return len(self._vol)
+
+    def _id(self, well):
+        if well is None:
+            return -1
+        assert isinstance(well, Well), (
+            "VolumeLedger: sources and destinations must be Wells or None")
+        if well not in self._ids:
+            self._ids[well] = len(self._wells)
+            self._wells.append(well)
+        return self._ids[well]
+
+    def add(self, source, destination, volume):
+        """Record a planned transfer
+
+        Parameters
+        ----------
+        source: Well, None
+            Well that is aspirated from. None for a dispense from outside
+            the simulated wells.
+        destination: Well, None
+            Well that receives the volume. None for volume that leaves the
+            simulated wells, e.g. for a consuming instruction.
+        volume: Unit, str, int, float
+            Volume transferred. Numbers are taken as microliter.
+
+        Returns
+        -------
+        int
+            Index of the instruction in the ledger
+
+        """
+        volume = _microliters(volume)
+        assert volume >= 0, "VolumeLedger: volume can not be negative"
+        self._src.append(self._id(source))
+        self._dst.append(self._id(destination))
+        self._vol.append(volume)
+        return len(self._vol) - 1
+
+    def extend(self, transfers):
+        """Record many planned transfers
+
+        Parameters
+        ----------
+        transfers: list
+            (source, destination, volume) tuples, such as the
+            NormalizationTransfer rows of `normalization_plan`
+
+        """
+        for source, destination, volume in transfers:
+            self.add(source, destination, volume)
+
+    def _initial_volumes(self):
+        return [_microliters(w.volume) if w.volume else 0.0
+                for w in self._wells]
+
+    def volumes(self):
+        """Simulated volumes after all recorded transfers
+
+        Returns
+        -------
+        dict
+            Well as key and volume in microliters (float) as value
+
+        """
+        running = self._initial_volumes()
+        for src, dst, vol in zip(self._src, self._dst, self._vol):
+            if src >= 0:
+                running[src] -= vol
+            if dst >= 0:
+                running[dst] += vol
+        return dict(zip(self._wells, running))
+
+    def replay(self):
+        """Replay all recorded transfers
+
+        Returns
+        -------
+        dict
+            Well as key and a `VolumeShortfall` namedtuple as value for all
+            wells that drop below the safe minimum volume of their container
+            when aspirated from. `safe_min_volume` and `dead_volume` are the
+            indices of the first instruction that leaves the well below that
+            volume, or None if it never does.
+
+        """
+        infos = [_container_info(w.container) for w in self._wells]
+        safe = [info.safe_min_volume_ul for info in infos]
+        dead = [info.dead_volume_ul for info in infos]
+
+        running = self._initial_volumes()
+        first_safe = {}
+        first_dead = {}
+        for i, (src, dst, vol) in enumerate(zip(self._src, self._dst,
+                                                self._vol)):
+            if src >= 0:
+                running[src] -= vol
+                if src not in first_dead and running[src] < dead[src]:
+                    first_dead[src] = i
+                    first_safe.setdefault(src, i)
+                elif src not in first_safe and running[src] < safe[src]:
+                    first_safe[src] = i
+            if dst >= 0:
+                running[dst] += vol
+
+        return dict((self._wells[w], VolumeShortfall(
+            safe_min_volume=i, dead_volume=first_dead.get(w)))
+            for w, i in first_safe.items())
@@ -1,5 +1,8 @@
 from autoprotocol_utilities import list_of_filled_wells
-from autoprotocol.container import Container
+from autoprotocol_utilities.container_helpers import _container_info
+from autoprotocol_utilities.misc_helpers import container_lock
+from autoprotocol.container import Container, WellGroup, Well
+from autoprotocol.unit import Unit
 import sys
 
 if sys.version_info[0] >= 3:
@@ -8,6 +11,153 @@ else:
     string_type = basestring
 
 
+class MaxVolumeTracker(object):
+    """Track the maximum fill volume of a container
+
+    Keeps the volume of every well of a container as a float in microliters
+    and updates the maximum fill volume as volumes are set or pipetted. Use
+    it in place of a container for `get_mag_amplicenter` when the same plate
+    goes through many magnetic steps, so the maximum volume does not have to
+    be recomputed from all wells for every step.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities.magnetic_helpers import \
+            MaxVolumeTracker, get_mag_amplicenter
+
+        p = Protocol()
+        example_plate = p.ref(name="Example", id=None, cont_type="96-pcr",
+                              storage="ambient")
+        tracker = MaxVolumeTracker(example_plate)
+        tracker.set_volume(example_plate.wells_from(0, 8), "100:microliter")
+        get_mag_amplicenter(tracker)
+        tracker.add_volume(example_plate.wells_from(0, 8), "-50:microliter")
+        get_mag_amplicenter(tracker)
+
+    Returns:
+
+    .. code-block:: json
+
+        {'center': 0.3125, 'amplitude': 0.3125}
+        {'center': 0.15625, 'amplitude': 0.15625}
+
+    Parameters
+    ----------
+    plate: Container
+        Plate to track. Current well volumes are read once on creation.
+
+    Raises
+    ------
+    ValueError
+        If plate is not of type `Container`
+
+    """
+
+    def __init__(self, plate):
+        assert isinstance(plate, Container)
+        self.container = plate
+        self.well_volume_ul = _container_info(plate).well_volume_ul
+        self.refresh()
+
+    def refresh(self):
+        """Re-read all well volumes from the container
+
+        Use this if well volumes were changed without going through the
+        tracker.
+
+        """
+        with container_lock(self.container):
+            self._volumes = [_to_microliter(w.volume) if w.volume else 0.0
+                             for w in self.container.all_wells()]
+            self._max = max(self._volumes)
+            self._stale = False
+
+    def _wells(self, wells):
+        if isinstance(wells, Well):
+            wells = [wells]
+        assert isinstance(wells, (list, WellGroup))
+        for well in wells:
+            assert isinstance(well, Well)
+            assert well.container is self.container, (
+                "MaxVolumeTracker: wells have to come from the tracked "
+                "container")
+        return wells
+
+    def _record(self, well, volume_ul):
+        old = self._volumes[well.index]
+        self._volumes[well.index] = volume_ul
+        if volume_ul >= self._max:
+            self._max = volume_ul
+            self._stale = False
+        elif old >= self._max:
+            self._stale = True
+
+    def set_volume(self, wells, volume):
+        """Set the volume of wells and update the maximum fill volume
+
+        Parameters
+        ----------
+        wells: Well, WellGroup, list
+            Wells of the tracked container
+        volume: Unit, str
+            Volume to set
+
+        Returns
+        -------
+        list, WellGroup, Well
+            The wells that were passed in
+
+        """
+        volume = Unit.fromstring(volume)
+        volume_ul = _to_microliter(volume)
+        with container_lock(self.container):
+            for well in self._wells(wells):
+                well.set_volume(volume)
+                self._record(well, volume_ul)
+        return wells
+
+    def add_volume(self, wells, volume):
+        """Add volume to (or remove volume from) wells after pipetting
+
+        Parameters
+        ----------
+        wells: Well, WellGroup, list
+            Wells of the tracked container
+        volume: Unit, str
+            Volume added to each well. Use a negative volume for removal.
+
+        Returns
+        -------
+        list, WellGroup, Well
+            The wells that were passed in
+
+        """
+        volume = Unit.fromstring(volume)
+        delta_ul = _to_microliter(volume)
+        with container_lock(self.container):
+            for well in self._wells(wells):
+                volume_ul = max(self._volumes[well.index] + delta_ul, 0.0)
+                well.set_volume(Unit(volume_ul, "microliter"))
+                self._record(well, volume_ul)
+        return wells
+
+    @property
+    def max_volume_ul(self):
+        """Maximum fill volume of the container in microliters (float)"""
+        if self._stale:
+            with container_lock(self.container):
+                self._max = max(self._volumes)
+                self._stale = False
+        return self._max
+
+
+def _to_microliter(volume):
+    return float(volume.to("microliter").magnitude)
+
+
 def get_mag_amplicenter(plate, amplitude_fraction=1.0):
     """Determine amplitude and center for KF operations
 
@@ -39,8 +189,9 @@ def get_mag_amplicenter(plate, amplitude_fraction=1.0):
 
     Parameters
     ----------
-    plate: Container
-        Plate that is being used
+    plate: Container, MaxVolumeTracker
+        Plate that is being used. Pass a `MaxVolumeTracker` to reuse the
+        tracked maximum fill volume instead of scanning all wells.
     amplitude_fraction: float, optional
         By default the full available amplitude will be used (from center to
         bottom of well). Use this parameter to reduce the amplitude.
@@ -53,18 +204,23 @@ def get_mag_amplicenter(plate, amplitude_fraction=1.0):
     Raises
     ------
     ValueError
-        If plate is not of type `Container`
+        If plate is not of type `Container` or `MaxVolumeTracker`
     ValueError
         If `amplitude_fraction` is not a float or bigger than 1
     """
 
-    assert isinstance(plate, Container)
+    assert isinstance(plate, (Container, MaxVolumeTracker))
     assert isinstance(amplitude_fraction, float)
     assert amplitude_fraction <= 1.0
-    max_cont_vol = plate.container_type.well_volume_ul
-    max_vol = max([x.volume for x in list_of_filled_wells(plate)])
+    if isinstance(plate, MaxVolumeTracker):
+        max_cont_vol = plate.well_volume_ul
+        max_vol = plate.max_volume_ul
+    else:
+        max_cont_vol = _container_info(plate).well_volume_ul
+        max_vol = max([_to_microliter(x.volume)
+                       for x in list_of_filled_wells(plate)])
 
-    ratio = float(max_vol.to_base_units() / max_cont_vol.to_base_units())
+    ratio = max_vol / max_cont_vol
 
     return {"center": ratio / 2, "amplitude": ratio / 2 / amplitude_fraction}
 
@@ -114,7 +270,7 @@ def get_mag_frequency(plate, speed):
     ValueError
         If plate type is not a key in `frequencies`
     """
-    name = plate.container_type.shortname
+    name = _container_info(plate).shortname
 
     frequencies = {"96-deep-kf": {"slow": "0.15:hertz", "medium": "1.5:hertz",
                                   "fast": "2.5:hertz"},
@@ -1,8 +1,12 @@
 from autoprotocol import UserError
 from collections import namedtuple
 from autoprotocol.container import Well, WellGroup
+import copy
 import datetime
+import numbers
 import sys
+import threading
+import weakref
 
 if sys.version_info[0] >= 3:
     string_type = str
@@ -10,16 +14,264 @@ else:
     string_type = basestring
 
 
-def user_errors_group(error_msgs, info=None):
+# Container to its lock, entries go away with the container
+_container_locks = weakref.WeakKeyDictionary()
+_container_locks_guard = threading.Lock()
+
+
+def container_lock(container):
+    """Get the lock of a container
+
+    Helpers that change wells (e.g. `set_pipettable_volume`,
+    `transfer_properties`) hold the lock of the containers they change, so
+    protocols can be built from several threads. Hold the same lock to
+    change wells of a shared container from your own code.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol, Unit
+        from autoprotocol_utilities import container_lock
+
+        p = Protocol()
+        plate = p.ref("plate", None, "96-pcr", discard=True)
+        with container_lock(plate):
+            well = plate.well(0)
+            well.set_volume(well.volume + Unit(5, "microliter"))
+
+    Parameters
+    ----------
+    container: Container
+        Container to lock
+
+    Returns
+    -------
+    threading.RLock
+        The same reentrant lock for every call with the same container
+
+    """
+    lock = _container_locks.get(container)
+    if lock is None:
+        with _container_locks_guard:
+            lock = _container_locks.get(container)
+            if lock is None:
+                lock = threading.RLock()
+                _container_locks[container] = lock
+    return lock
+
+
+class _ContainerLocks(object):
+    """Hold the locks of several containers, always taken in the same order
+    so threads locking overlapping containers can not deadlock."""
+
+    def __init__(self, containers):
+        unique = dict((id(c), c) for c in containers)
+        self.locks = [container_lock(unique[k]) for k in sorted(unique)]
+
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        for lock in reversed(self.locks):
+            lock.release()
+        return False
+
+
+CollectedError = namedtuple("CollectedError",
+                            ["category", "message", "container"])
+
+
+class ErrorCollector(object):
+    """Collect protocol errors and raise them as one bounded UserError
+
+    Errors are grouped by category and container. The UserError message
+    lists at most `limit` distinct messages per group, repeated messages
+    are shown once with their count and the rest of a group is collapsed
+    into a single "N more" entry, so the message stays short however
+    many errors are found. All errors remain available in `errors`, and
+    the UserError carries the collector as its `info` unless other info
+    is given.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import ErrorCollector, volume_check
+
+        p = Protocol()
+        plate = p.ref("plate", None, "96-pcr", discard=True)
+        plate.all_wells().set_volume("2:microliter")
+        errors = ErrorCollector(limit=2)
+        for well in plate.all_wells():
+            errors.add(volume_check(well), "dead volume", plate)
+        errors.counts()
+        errors.summary()
+
+    Returns:
+
+    .. code-block:: none
+
+        {('dead volume', Container(plate)): 96}
+
+        '96 error(s) found in this protocol: <Error 1> 1 volume errors: You
+        want to pipette from a container with 3.0 ul dead volume. However,
+        your aliquot: plate-0, only has 2.0 ul. <Error 2> 1 volume errors:
+        You want to pipette from a container with 3.0 ul dead volume.
+        However, your aliquot: plate-1, only has 2.0 ul. <Error 3> 94 more
+        dead volume error(s) in Container(plate)'
+
+    Parameters
+    ----------
+    limit: int, optional
+        Distinct messages shown per category and container, None shows all
+    max_groups: int, optional
+        Categories and containers shown, None shows all
+
+    """
+
+    def __init__(self, limit=5, max_groups=20):
+        assert limit is None or limit > 0, (
+            "ErrorCollector: limit has to be positive")
+        assert max_groups is None or max_groups > 0, (
+            "ErrorCollector: max_groups has to be positive")
+        self.limit = limit
+        self.max_groups = max_groups
+        self.errors = []
+        # (category, container) -> [shown messages, their counts, number
+        # of errors in the group], groups in the order they were found
+        self._groups = {}
+        self._keys = []
+
+    def add(self, message, category=None, container=None):
+        """Add an error, None and empty messages are ignored
+
+        Parameters
+        ----------
+        message: str
+            Error message
+        category: str, optional
+            Kind of error, e.g. "dead volume"
+        container: Container, optional
+            Container the error refers to
+
+        """
+        if not message:
+            return
+        self.errors.append(CollectedError(category, message, container))
+        key = (category, container)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [[], {}, 0]
+            self._keys.append(key)
+        messages, counts, total = group
+        group[2] = total + 1
+        if message in counts:
+            counts[message] += 1
+        elif self.limit is None or len(messages) < self.limit:
+            messages.append(message)
+            counts[message] = 1
+
+    def extend(self, messages, category=None, container=None):
+        """Add several errors of the same category and container
+
+        Parameters
+        ----------
+        messages: list
+            Error messages, None entries are ignored
+
+        """
+        for message in messages:
+            self.add(message, category, container)
+
+    def counts(self):
+        """Number of errors by category and container
+
+        Returns
+        -------
+        dict
+            (category, container) as key and number of errors as value
+
+        """
+        return dict((key, group[2]) for key, group in self._groups.items())
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __bool__(self):
+        return bool(self.errors)
+
+    __nonzero__ = __bool__
+
+    def summary(self):
+        """Bounded summary of all errors as used in the UserError
+
+        Returns
+        -------
+        str
+
+        """
+        keys = self._keys
+        if self.max_groups is not None:
+            keys = keys[:self.max_groups]
+        entries = []
+        for key in keys:
+            messages, counts, total = self._groups[key]
+            for message in messages:
+                count = counts[message]
+                entries.append(message if count == 1 else
+                               "%s (%s times)" % (message, count))
+            hidden = total - sum(counts.values())
+            if hidden:
+                category, container = key
+                entries.append("%s more %serror(s)%s" % (
+                    hidden, "%s " % category if category else "",
+                    "" if container is None else " in %s" % (container,)))
+        if len(keys) < len(self._keys):
+            entries.append("%s more error(s) in %s other group(s)" % (
+                sum(self._groups[key][2] for key in self._keys[len(keys):]),
+                len(self._keys) - len(keys)))
+        return "%s error(s) found in this protocol: " % len(self.errors) + \
+            " ".join(["<Error %s> %s" % (i + 1, m)
+                      for i, m in enumerate(entries)])
+
+    def raise_errors(self, info=None):
+        """Raise a UserError with the summary if any errors were collected
+
+        Parameters
+        ----------
+        info: optional
+            Passed to the UserError, defaults to the collector
+
+        Raises
+        ------
+        UserError
+            If errors were collected
+
+        """
+        if self.errors:
+            raise UserError(self.summary(),
+                            info=self if info is None else info)
+
+
+def user_errors_group(error_msgs, info=None, limit=None):
     """Takes a list error messages and neatly displays as a single UserError
 
     Will automatically remove instances of None and only report errors if list
-    is not empty.
+    is not empty. Repeated messages are shown once with their count. Use
+    `ErrorCollector` to group errors by category and container.
 
     Parameters
     ----------
     error_msgs : list
         List of strings that are the error messages
+    info : optional
+        Passed to the UserError
+    limit : int, optional
+        Distinct messages to show, the rest is summarized as a count
 
     Raises
     ------
@@ -31,13 +283,10 @@ def user_errors_group(error_msgs, info=None):
                                           " of a list to properly format the "
                                           "grouped message.")
 
-    error_msgs = [_f for _f in error_msgs if _f]
-    if len(error_msgs) != 0:
-        raise UserError(
-            "%s error(s) found in this protocol: " % len(error_msgs) +
-            " ".join(["<Error " +
-                      str(i + 1) + "> " +
-                      str(m) for i, m in enumerate(error_msgs)]), info=info)
+    errors = ErrorCollector(limit=limit)
+    errors.extend(str(m) for m in error_msgs if m)
+    if errors:
+        raise UserError(errors.summary(), info=info)
 
 
 def printdatetime():
@@ -211,22 +460,197 @@ def char_limit(label, length=22, trunc=False, clip=False):
     """
     assert isinstance(label, string_type), "Label has to be of type string"
 
-    r = namedtuple('Response', 'label error_message')
-    if trunc and len(label) > length:
-        label = label[0: length]
-    if clip and len(label) > length:
-        label = label[len(label) - length: len(label)]
-
+    label = _fit_label(label, length, trunc, clip)
     error_message = None
     if len(label) > length:
-        error_message = ("The specified label, '%s', has too many characters."
-                         " Please enter a label of %s or fewer "
-                         "characters.") % (label, length)
+        error_message = _label_error(label, length)
+
+    return _CharLimitResponse(label=label, error_message=error_message)
+
+
+_CharLimitResponse = namedtuple('Response', 'label error_message')
+
+
+def _fit_label(label, length, trunc, clip):
+    if len(label) > length:
+        if trunc:
+            return label[:length]
+        if clip:
+            return label[len(label) - length:]
+    return label
+
+
+def _label_error(label, length):
+    return ("The specified label, '%s', has too many characters."
+            " Please enter a label of %s or fewer "
+            "characters.") % (label, length)
+
+
+class SanitizedLabels(object):
+    """Labels checked and corrected by `sanitize_labels`
+
+    Indexing and iteration give the corrected labels. Error messages are
+    only formatted when asked for.
+
+    Attributes
+    ----------
+    labels: list
+        Corrected labels in input order
+    length: int
+        Maximum label length
+    changed: list
+        Indices of labels that were truncated, clipped or made unique
+    too_long: list
+        Indices of labels that are still longer than `length`
+
+    """
+    __slots__ = ('labels', 'length', 'changed', 'too_long')
+
+    def __init__(self, labels, length, changed, too_long):
+        self.labels = labels
+        self.length = length
+        self.changed = changed
+        self.too_long = too_long
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __getitem__(self, index):
+        return self.labels[index]
+
+    def __bool__(self):
+        return not self.too_long
+
+    __nonzero__ = __bool__
+
+    def error_messages(self):
+        """Error messages of labels that are too long, as from `char_limit`
+
+        Returns
+        -------
+        list
+
+        """
+        return [_label_error(self.labels[i], self.length)
+                for i in self.too_long]
+
+    def add_errors(self, collector, category="label length"):
+        """Add the error messages to an `ErrorCollector`
+
+        Parameters
+        ----------
+        collector: ErrorCollector
+        category: str, optional
 
-    return r(label=label, error_message=error_message)
+        """
+        collector.extend(self.error_messages(), category)
 
 
-def recursive_search(params, class_name=None, method=None, args={}):
+def sanitize_labels(labels, length=22, trunc=False, clip=False,
+                    unique=False, separator="_"):
+    """Enforce a string limit and uniqueness on a list of labels
+
+    Batch version of `char_limit` for labeling many containers or
+    aliquots in one pass. Labels are truncated or clipped as in
+    `char_limit`. With `unique`, repeated labels get a numbered suffix
+    (`sample_2`, `sample_3`, ...) that never clashes with another label of
+    the list; with `trunc` or `clip` the label is shortened further to make
+    room for the suffix.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import sanitize_labels
+
+        res = sanitize_labels(["sample", "sample", "sample_2",
+                               "a_very_long_sample_name"],
+                              length=10, trunc=True, unique=True)
+        res.labels
+        res.changed
+
+    Returns:
+
+    .. code-block:: python
+
+        ['sample', 'sample_3', 'sample_2', 'a_very_lon']
+        [1, 3]
+
+    Parameters
+    ----------
+    labels : list
+        Strings to check.
+    length : int, optional
+        Maximum label length. Default: 22.
+    trunc : bool, optional
+        Truncate labels that are too long. Default: False.
+    clip : bool, optional
+        Clip labels (remove from the beginning) that are too long.
+        Default: False. If both trunc and clip are True, trunc will take
+        effect and not clip.
+    unique : bool, optional
+        Add a numbered suffix to repeated labels. Default: False.
+    separator : str, optional
+        Placed between label and suffix. Default: "_".
+
+    Returns
+    -------
+    SanitizedLabels
+        Corrected labels with the indices of changed labels and of labels
+        that are still too long
+
+    Raises
+    ------
+    ValueError
+        If a label is not of type string
+
+    """
+    result = []
+    changed = set()
+    for i, label in enumerate(labels):
+        assert isinstance(label, string_type), (
+            "Label %s has to be of type string" % i)
+        fitted = _fit_label(label, length, trunc, clip)
+        if fitted is not label:
+            changed.add(i)
+        result.append(fitted)
+
+    if unique:
+        taken = set(result)
+        seen = set()
+        # prefix -> first suffix number not tried yet, all lower numbers
+        # are taken, so labels shortened to the same prefix skip them
+        suffixes = {}
+        for i, label in enumerate(result):
+            if label not in seen:
+                seen.add(label)
+                continue
+            n = 2
+            while True:
+                suffix = "%s%s" % (separator, n)
+                prefix = _fit_label(label, max(length - len(suffix), 0),
+                                    trunc, clip)
+                if suffixes.get(prefix, 2) > n:
+                    n = suffixes[prefix]
+                    continue
+                n += 1
+                suffixes[prefix] = n
+                candidate = prefix + suffix
+                if candidate not in taken:
+                    break
+            taken.add(candidate)
+            seen.add(candidate)
+            result[i] = candidate
+            changed.add(i)
+
+    too_long = [i for i, label in enumerate(result) if len(label) > length]
+    return SanitizedLabels(result, length, sorted(changed), too_long)
+
+
+def recursive_search(params, class_name=None, method=None, args=None):
     """Recursive params checker
 
     Iterates through all items of a passed in dict, tuple, or list
@@ -285,6 +709,7 @@ def recursive_search(params, class_name=None, method=None, args={}):
 
     """
 
+    args = args or {}
     all_fields = []
 
     def find_all_fields(params):
@@ -321,8 +746,112 @@ def recursive_search(params, class_name=None, method=None, args={}):
         return all_fields
 
 
-def transfer_properties(src_wells, dest_wells, properties={}, args={},
-                        pset=False):
+def _read_only(self, *args, **kwargs):
+    raise TypeError("SharedProperties are shared between wells and can not "
+                    "be changed. Use set_properties on the well, or "
+                    "unshare_properties before add_properties.")
+
+
+class SharedProperties(dict):
+    """Read-only well properties shared by several wells
+
+    `transfer_properties(..., pset=True, share=True)` gives destination
+    wells a reference to one shared copy of the properties of their source
+    well instead of a copy each, so replicating a plate many times keeps
+    one property dict per source well. The source well itself is not
+    changed.
+
+    Changing the mapping raises a TypeError, so `Well.add_properties`
+    fails on wells holding SharedProperties. `set_properties` replaces
+    them with a new dict as usual, `unshare_properties` gives wells a
+    private copy to add to. `transfer_properties` and
+    `PropertyColumns.apply` copy shared properties before adding to them.
+
+    SharedProperties is a dict, so it serializes, compares and copies like
+    the properties of any other well.
+
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (SharedProperties, (dict(self),))
+
+
+def unshare_properties(wells):
+    """Give wells holding SharedProperties a private copy of them
+
+    Call it before `add_properties` on wells that got their properties
+    from `transfer_properties(..., share=True)`.
+
+    Parameters
+    ----------
+    wells: Well, list, WellGroup
+        Wells to unshare, wells with private properties are not changed
+
+    """
+    if isinstance(wells, Well):
+        wells = [wells]
+    for well in wells:
+        if isinstance(well.properties, SharedProperties):
+            well.properties = dict(well.properties)
+
+
+# Source well -> SharedProperties given to its replicates
+_shared_sources = weakref.WeakKeyDictionary()
+
+
+def _shared_copy(well):
+    """Shared copy of the properties of a well, reused for later
+    replicates as long as they hold the very same values."""
+    props = well.properties
+    if isinstance(props, SharedProperties):
+        return props
+    shared = _shared_sources.get(well)
+    if shared is None or len(shared) != len(props) or \
+            not all(k in props and props[k] is v for k, v in shared.items()):
+        shared = _shared_sources[well] = SharedProperties(props)
+    return shared
+
+
+# Memoized results of these types are handed out as they are, others are
+# copied so wells do not share one mutable object
+_IMMUTABLE = (string_type, bytes, numbers.Number, tuple, frozenset,
+              type(None))
+
+
+def _transform(func, kwargs, memoize):
+    """Property transform, evaluated once per unique (hashable) value if
+    memoize is set."""
+    if func is None:
+        return lambda value: value
+    if not memoize:
+        return lambda value: func(value, **kwargs)
+    results = {}
+
+    def transform(value):
+        key = (type(value), value)
+        try:
+            hash(key)
+        except TypeError:
+            return func(value, **kwargs)
+        if key not in results:
+            results[key] = func(value, **kwargs)
+        result = results[key]
+        if isinstance(result, _IMMUTABLE):
+            return result
+        return copy.copy(result)
+    return transform
+
+
+def transfer_properties(src_wells, dest_wells, properties=None, args=None,
+                        pset=False, memoize=False, share=False):
     """Transfer all or select propeties from one well to another
 
     Uses add_properties to transfer the properties from one well to another
@@ -340,6 +869,20 @@ def transfer_properties(src_wells, dest_wells, properties={}, args={},
         function and the value another dict containing the arguments.
     pset: bool, optional
         Indicate where to set or add the property, defaults to add.
+    memoize: bool, optional
+        Call each function only once per unique property value and reuse
+        the result for all wells with that value. Only use it with
+        functions that return the same result for the same input. Mutable
+        results are shallow copied for every well.
+    share: bool, optional
+        With pset, give destination wells a shared read-only reference to
+        the properties instead of a copy, see `SharedProperties`. If all
+        properties are transferred, all replicates of a source well share
+        one dict, also across calls. With `properties`, destination wells
+        of one call that get equal (hashable) values share a dict, wells
+        with unhashable values get a private copy. Source wells are not
+        changed. Use `unshare_properties` before `add_properties` on the
+        destination wells.
 
     Returns
     -------
@@ -363,6 +906,9 @@ def transfer_properties(src_wells, dest_wells, properties={}, args={},
     if isinstance(dest_wells, Well):
         dest_wells = [dest_wells]
 
+    if properties is None:
+        properties = {}
+    args = args or {}
     assert isinstance(src_wells, (list, WellGroup))
     assert isinstance(dest_wells, (list, WellGroup))
     assert len(src_wells) == len(dest_wells)
@@ -370,36 +916,198 @@ def transfer_properties(src_wells, dest_wells, properties={}, args={},
     for well in list(src_wells) + list(dest_wells):
         assert isinstance(well, Well)
 
-    def dummy(prop):
-        return prop
-
+    transforms = [(prop, _transform(func, args.get(prop, {}), memoize))
+                  for prop, func in properties.items()]
     error_messages = []
 
-    if len(properties) == 0:
-        for i, well in enumerate(src_wells):
-            if pset:
-                dest_wells[i].set_properties(well.properties)
-            else:
-                dest_wells[i].add_properties(well.properties)
-    else:
-        for prop, func in properties.items():
-            if func is None:
-                func = dummy
-            for i, well in enumerate(src_wells):
-                if prop in well.properties:
-                    if pset:
-                        dest_wells[i].set_properties(
-                            {prop: func(well.properties[prop],
-                                        **args.get(prop, {}))})
+    # one add/set per well with all transferred properties
+    share = share and pset
+    # transferred properties -> SharedProperties, for share with transforms
+    shared = {}
+    locked = list(dest_wells) + (list(src_wells) if share else [])
+    with _ContainerLocks(w.container for w in locked):
+        for src, dest in zip(src_wells, dest_wells):
+            src_props = src.properties
+            if transforms:
+                props = {}
+                for prop, func in transforms:
+                    if prop in src_props:
+                        props[prop] = func(src_props[prop])
                     else:
-                        dest_wells[i].add_properties(
-                            {prop: func(well.properties[prop],
-                                        **args.get(prop, {}))})
-                else:
-                    error_messages.append("Could not find property %s on "
-                                          "well%s." % (prop, well))
+                        error_messages.append("Could not find property %s on "
+                                              "well%s." % (prop, src))
+                if not props:
+                    continue
+                if share:
+                    key = tuple((prop, type(props[prop]), props[prop])
+                                for prop, _ in transforms if prop in props)
+                    try:
+                        if key not in shared:
+                            shared[key] = SharedProperties(props)
+                    except TypeError:
+                        dest.set_properties(props)
+                        continue
+                    props = shared[key]
+            elif share:
+                props = _shared_copy(src)
+            else:
+                props = src_props
+            if share:
+                dest.properties = props
+            elif pset:
+                dest.set_properties(props)
+            else:
+                unshare_properties(dest)
+                dest.add_properties(props)
 
     if len(error_messages) > 0:
         return error_messages
     else:
         return None
+
+
+class PropertyColumns(object):
+    """Well properties of a container stored as one list per property
+
+    Holds the properties of all wells of a container column by column:
+    `columns[prop][index]` is the value of `prop` on well `index`, or
+    `None` if the well does not have it. Copying the columns to another
+    plate copies one list per property instead of one dict per well, and
+    `transform` calls a function once per unique value of a column.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import PropertyColumns
+
+        p = Protocol()
+        src = p.ref("src", None, "96-pcr", discard=True)
+        dest = p.ref("dest", None, "96-pcr", discard=True)
+        for well in src.all_wells():
+            well.set_properties({"sample": "s%s" % (well.index % 4)})
+
+        columns = PropertyColumns.from_container(src)
+        columns.transform("sample", lambda s: s + "-copy")
+        columns.copy(dest).apply()
+        dest.well(5).properties
+
+    Returns:
+
+    .. code-block:: python
+
+        {'sample': 's1-copy'}
+
+    Parameters
+    ----------
+    container: Container
+        Container the properties belong to
+    columns: dict, optional
+        Property name as key and a list of values by well index as value
+
+    """
+
+    def __init__(self, container, columns=None):
+        self.container = container
+        self.well_count = container.container_type.well_count
+        self.columns = dict(columns or {})
+        for prop, values in self.columns.items():
+            assert len(values) == self.well_count, (
+                "PropertyColumns: column %s needs one value per well" % prop)
+
+    @classmethod
+    def from_container(cls, container, properties=None):
+        """Read the properties of all wells of a container
+
+        Parameters
+        ----------
+        container: Container
+            Container to read
+        properties: list, optional
+            Properties to read, defaults to all properties found
+
+        Returns
+        -------
+        PropertyColumns
+
+        """
+        wells = container.all_wells()
+        columns = {}
+        for well in wells:
+            for prop in well.properties:
+                if properties is None or prop in properties:
+                    if prop not in columns:
+                        columns[prop] = [None] * len(wells)
+                    columns[prop][well.index] = well.properties[prop]
+        return cls(container, columns)
+
+    def transform(self, prop, func, memoize=False, **kwargs):
+        """Apply a function to every value of a property column
+
+        Wells without the property are skipped.
+
+        Parameters
+        ----------
+        prop: str
+            Property to transform
+        func: function
+            Called with the value and `kwargs`, returns the new value
+        memoize: bool, optional
+            Call the function only once per unique value, as in
+            `transfer_properties`
+
+        Returns
+        -------
+        PropertyColumns
+            self, to chain calls
+
+        """
+        func = _transform(func, kwargs, memoize)
+        self.columns[prop] = [None if v is None else func(v)
+                              for v in self.columns[prop]]
+        return self
+
+    def copy(self, container):
+        """Copy the columns to another container of the same well count
+
+        Parameters
+        ----------
+        container: Container
+            Container the copy belongs to
+
+        Returns
+        -------
+        PropertyColumns
+
+        """
+        assert container.container_type.well_count == self.well_count, (
+            "PropertyColumns: containers need the same number of wells")
+        return PropertyColumns(container, dict(
+            (prop, list(values)) for prop, values in self.columns.items()))
+
+    def apply(self, pset=False):
+        """Write the properties to the wells of the container
+
+        Parameters
+        ----------
+        pset: bool, optional
+            Replace the well properties instead of adding to them
+
+        Returns
+        -------
+        Container
+
+        """
+        items = list(self.columns.items())
+        with container_lock(self.container):
+            for well in self.container.all_wells():
+                index = well.index
+                props = dict((prop, values[index]) for prop, values in items
+                             if values[index] is not None)
+                if pset:
+                    well.set_properties(props)
+                elif props:
+                    unshare_properties(well)
+                    well.add_properties(props)
+        return self.container
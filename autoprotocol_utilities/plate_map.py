@@ -0,0 +1,192 @@
+from .container_helpers import _container_info
+import math
+
+# Symbols for occupancy maps
+_EMPTY = "."
+_FILLED = "#"
+# Heatmap levels, from lowest to highest non-zero value
+_LEVELS = "123456789"
+
+
+def _row_label(row):
+    """Row letters as used for microplates: A-Z, then AA-AF for 1536."""
+    if row < 26:
+        return chr(65 + row)
+    return "A" + chr(65 + row - 26)
+
+
+def _geometry(container):
+    if isinstance(container, tuple):
+        assert len(container) == 2, (
+            "plate map: container must be a container type or a "
+            "(rows, columns) tuple")
+        return container
+    info = _container_info(container)
+    if info is None:
+        raise ValueError("plate map: unknown container type %s" % container)
+    return info.rows, info.cols
+
+
+def _cells(data, well_count):
+    """Value of every well, without building an intermediate list."""
+    if isinstance(data, int):
+        return ((data >> i) & 1 for i in range(well_count))
+    if isinstance(data, dict):
+        return (data.get(i) for i in range(well_count))
+    if len(data) < well_count:
+        return (data[i] if i < len(data) else 0 for i in range(well_count))
+    return iter(data)
+
+
+def render_plate_map(data, container, scale=None, header=True,
+                     occupancy=False):
+    """Render well occupancy or values as a text plate map
+
+    Occupancy (a bitmask, or any data with `occupancy`) is drawn with `#`
+    for filled and `.` for empty wells. Sequences and dicts of values are
+    drawn as a heatmap with levels 1 to 9 relative to `scale`, `.` for
+    empty or 0 wells.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import render_plate_map
+
+        print(render_plate_map(0b1000000000111, (2, 12)))
+        print(render_plate_map([10, 20, 0, None, 5, 20], (2, 3)))
+        print(render_plate_map([0.5, 1, 0], (1, 3), occupancy=True))
+
+    Returns:
+
+    .. code-block:: none
+
+           1  2  3  4  5  6  7  8  9 10 11 12
+        A  #  #  #  .  .  .  .  .  .  .  .  .
+        B  #  .  .  .  .  .  .  .  .  .  .  .
+
+          1 2 3
+        A 5 9 .
+        B . 3 9
+
+          1 2 3
+        A # # .
+
+    Parameters
+    ----------
+    data: int, bytes, bytearray, list, dict
+        Bitmask of filled wells (bit `i` for well index `i`), a sequence
+        of values by well index (e.g. a list from `binary_list`, a
+        bytearray or volumes in microliters) or a dict of well index to
+        value
+    container: Container, ContainerType, str, tuple
+        Container, container type, container type shortname or a
+        (rows, columns) tuple, e.g. (32, 48) for 1536 well plates
+    scale: int, float, optional
+        Value shown as level 9 in heatmaps. Defaults to the largest value.
+    header: bool, optional
+        Include column numbers and row letters
+    occupancy: bool, optional
+        Draw non-zero values of a sequence or dict as filled wells instead
+        of a heatmap, e.g. for a list from `binary_list`
+
+    Returns
+    -------
+    str
+        Plate map with one line per row
+
+    Raises
+    ------
+    ValueError
+        If the container type is unknown
+
+    """
+    assert scale is None or scale > 0, (
+        "render_plate_map: scale has to be positive")
+    rows, cols = _geometry(container)
+    well_count = rows * cols
+    binary = occupancy or isinstance(data, int)
+    if not binary and scale is None:
+        values = data.values() if isinstance(data, dict) else data
+        scale = max([v for v in values if v] or [0])
+
+    if binary:
+        def symbol(value):
+            return _FILLED if value else _EMPTY
+    else:
+        def symbol(value):
+            if not value or value <= 0:
+                return _EMPTY
+            level = int(math.ceil(min(value, scale) / float(scale) *
+                                  len(_LEVELS)))
+            return _LEVELS[max(level, 1) - 1]
+
+    width = len(str(cols)) + 1
+    label_width = 2 if rows > 26 else 1
+    cells = _cells(data, well_count)
+    lines = []
+    if header:
+        lines.append(" " * label_width +
+                     "".join(str(c + 1).rjust(width) for c in range(cols)))
+    for row in range(rows):
+        line = "".join(symbol(next(cells)).rjust(width)
+                       for _ in range(cols))
+        if header:
+            line = _row_label(row).ljust(label_width) + line
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def plate_map_rle(data, container):
+    """Run-length encode well occupancy or values for logging
+
+    Runs of equal values are written as `value*count`, in well index
+    order, so a full 96 well plate is `1*96`.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import plate_map_rle
+
+        plate_map_rle(0b1000000000111, "96-flat")
+        plate_map_rle([10, 10, 0, 0, 5], (1, 5))
+
+    Returns:
+
+    .. code-block:: none
+
+        '1*3,0*9,1*1,0*83'
+        '10*2,0*2,5*1'
+
+    Parameters
+    ----------
+    data: int, bytes, bytearray, list, dict
+        Bitmask, sequence or dict of values by well index as accepted by
+        `render_plate_map`. Empty (None) values are encoded as 0.
+    container: Container, ContainerType, str, tuple
+        Container, container type, container type shortname or a
+        (rows, columns) tuple
+
+    Returns
+    -------
+    str
+        Comma separated runs
+
+    """
+    rows, cols = _geometry(container)
+    runs = []
+    current = None
+    count = 0
+    for value in _cells(data, rows * cols):
+        value = value or 0
+        if count and value == current:
+            count += 1
+            continue
+        if count:
+            runs.append("%s*%d" % (current, count))
+        current = value
+        count = 1
+    if count:
+        runs.append("%s*%d" % (current, count))
+    return ",".join(runs)
@@ -1,4 +1,5 @@
 from collections import namedtuple
+from .well_set import WellSet
 
 try:
     reduce = reduce
@@ -130,38 +131,38 @@ def max_histogram_area(histogram):
 def binary_list(wells, length=None):
     """Turns a list of indices into a binary list with list at
     indices that appear in the initial list set to 1, and 0
-    otherwise. `wells` must be sorted, `length` is the length of
-    the resulting list.
+    otherwise. `wells` can be unsorted and contain duplicates, `length` is
+    the length of the resulting list. Indices outside of `length` are
+    ignored.
 
     .. code-block:: none
 
-        [bnry for bnry in binary_list([1, 3, 5], length=7)]
+        [bnry for bnry in binary_list([5, 1, 3, 1], length=7)]
         [0, 1, 0, 1, 0, 1, 0]
 
     Parameters
     ----------
-    wells: Sorted list
+    wells: list, WellSet
         The wells that need to be changed into a binary list
     length: Int
-        The length of the total list
+        The length of the total list. Defaults to the well count of the
+        container for a WellSet and to the largest index + 1 otherwise.
 
     Returns
     -------
-    None
-        Turns wells into a binary list
+    iterator
+        1 at the indices in wells, 0 everywhere else
 
     """
+    if isinstance(wells, WellSet):
+        length = length or wells.container.container_type.well_count
+        wells = wells.indices()
     length = length or max(wells) + 1
-    wells_ptr = 0
-    for i in range(length):
-        try:
-            if wells[wells_ptr] == i:
-                wells_ptr += 1
-                yield 1
-            else:
-                yield 0
-        except IndexError:
-            yield 0
+    bnry = [0] * length
+    for i in wells:
+        if 0 <= i < length:
+            bnry[i] = 1
+    return iter(bnry)
 
 
 def get_quadrant_indices(quad):
@@ -196,7 +197,7 @@ def get_quadrant_binary_list(binary_list, quad=[0, 1, 2, 3]):
 
     Parameters
     ----------
-    binary_list: List
+    binary_list: List, WellSet
         The 384 element well plate
 
     quad: list
@@ -209,6 +210,9 @@ def get_quadrant_binary_list(binary_list, quad=[0, 1, 2, 3]):
         quadrants
 
     """
+    if isinstance(binary_list, WellSet):
+        bits = binary_list.bits
+        binary_list = [bits >> i & 1 for i in range(384)]
     assert len(binary_list) == 384
     for q in quad:
         assert q in [0, 1, 2, 3]
@@ -284,7 +288,7 @@ def chop_list(lst, chop_length, filler=None):
             ret.append(row)
         # end of list, but last row needs filling up
         else:
-            ret.append(row + [filler] * (chop_length - row_len))
+            ret.append(list(row) + [filler] * (chop_length - row_len))
             return ret
 
     return ret
@@ -1,8 +1,14 @@
 from autoprotocol.container import Container
 from autoprotocol.protocol import Ref
 from autoprotocol import Unit
+from .container_helpers import _container_info
 from collections import namedtuple
+import hashlib
+import json
+import math
+import os
 import sys
+import threading
 
 if sys.version_info[0] >= 3:
     string_type = str
@@ -10,6 +16,34 @@ else:
     string_type = basestring
 
 
+# Oligo scale to allowed [min, max] length in bases (IDT limits)
+_OLIGO_SCALE_RANGES = {
+    '10nm': (15, 60),
+    '25nm': (15, 60),
+    '100nm': (10, 90),
+    '250nm': (5, 100),
+    '1um': (5, 100)
+}
+
+OligoScaleResponse = namedtuple('Response', 'success error_message')
+OligoBatchResponse = namedtuple('OligoBatchResponse', 'success failures')
+OligoScaleFailure = namedtuple('OligoScaleFailure',
+                               'index label length scale error_message')
+
+
+def _oligo_scale_error(label, length, scale):
+    if scale not in _OLIGO_SCALE_RANGES:
+        return ("The specified oligo, '{0!s}', does not have a recognized "
+                "scale ({1!s}). Recognized scales are: {2!s}".format(
+                    label, scale, ', '.join(sorted(_OLIGO_SCALE_RANGES))))
+    low, high = _OLIGO_SCALE_RANGES[scale]
+    return ("The specified oligo, '{0!s}', is {1!s} base pairs "
+            "long. This sequence length is invalid for the scale"
+            " of synthesis chosen ({2!s}). The acceptable range "
+            "for this scale is {3!s} - {4!s} base pairs "
+            "long".format(label, length, scale, low, high))
+
+
 def oligo_scale_default(length, scale, label):
     """Detects if the oligo length matches the selected scale
 
@@ -34,36 +68,101 @@ def oligo_scale_default(length, scale, label):
         success
 
     """
+    limits = _OLIGO_SCALE_RANGES.get(scale)
+    if limits and limits[0] <= length <= limits[1]:
+        return OligoScaleResponse(success=True, error_message=None)
+    return OligoScaleResponse(success=False,
+                              error_message=_oligo_scale_error(
+                                  label, length, scale))
 
-    r = namedtuple('Response', 'success error_message')
-    ok = True
-    error_message = None
-    scale_ranges = {
-        '10nm': [15, 60],
-        '25nm': [15, 60],
-        '100nm': [10, 90],
-        '250nm': [5, 100],
-        '1um': [5, 100]
-    }
-
-    if scale not in scale_ranges.keys():
-        error_message = ("The specified oligo, '{0!s}', does not have a "
-                         "recognized scale of {0!s}".format(
-                             ', '.join(scale_ranges.keys)))
-    else:
-        ok = True if ((length >= scale_ranges[scale][0]) & (
-            length <= scale_ranges[scale][1])) else False
 
-    if not ok:
-        error_message = ("The specified oligo, '{0!s}', is {1!s} base pairs "
-                         "long. This sequence length is invalid for the scale"
-                         " of synthesis chosen ({2!s}). The acceptable range "
-                         "for this scale is {3!s} - {4!s} base pairs "
-                         "long".format(label, length, scale,
-                                       scale_ranges[scale][0],
-                                       scale_ranges[scale][1]))
+def oligo_scale_batch(lengths, scales, labels=None):
+    """Detects which oligos of an order match their selected scale
+
+    Batch version of `oligo_scale_default` for whole oligo orders. Error
+    messages are only built for the oligos that fail.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import oligo_scale_batch
+
+        res = oligo_scale_batch([50, 115, 4], ["10nm", "100nm", "1um"],
+                                ["oligo_1", "oligo_2", "oligo_3"])
+        res.success
+        [f.label for f in res.failures]
+
+    Returns:
+
+    .. code-block:: python
+
+        [True, False, False]
+        ['oligo_2', 'oligo_3']
+
+    Parameters
+    ----------
+    lengths : list
+        Lengths of the oligos (int).
+    scales : list, str
+        Scales of the oligos. A single scale is used for all oligos.
+    labels : list, optional
+        Names of the oligos. Defaults to the index in the order.
+
+    Returns
+    -------
+    namedtuple
+        'success' (list of bool, one per oligo) and 'failures' (list of
+        `OligoScaleFailure` namedtuples with index, label, length, scale
+        and error_message)
 
-    return r(success=ok, error_message=error_message)
+    Raises
+    ------
+    ValueError
+        If scales or labels do not have the same length as lengths
+
+    """
+    lengths = list(lengths)
+    if isinstance(scales, string_type):
+        scales = [scales] * len(lengths)
+    assert len(scales) == len(lengths), (
+        "oligo_scale_batch: scales and lengths have to be of equal length")
+    if labels is not None:
+        assert len(labels) == len(lengths), (
+            "oligo_scale_batch: labels and lengths have to be of equal "
+            "length")
+
+    ranges = _OLIGO_SCALE_RANGES
+    success = []
+    failed = []
+    for i, (length, scale) in enumerate(zip(lengths, scales)):
+        limits = ranges.get(scale)
+        ok = bool(limits) and limits[0] <= length <= limits[1]
+        success.append(ok)
+        if not ok:
+            failed.append(i)
+
+    failures = []
+    for i in failed:
+        label = labels[i] if labels is not None else i
+        failures.append(OligoScaleFailure(
+            index=i, label=label, length=lengths[i], scale=scales[i],
+            error_message=_oligo_scale_error(label, lengths[i], scales[i])))
+
+    return OligoBatchResponse(success=success, failures=failures)
+
+
+# Oligo dilution table: diluent volume (uL) per concentration (rows) and
+# scale (columns)
+_OLIGO_CONCENTRATIONS = ('100uM', '1mM')
+_OLIGO_SCALES = ('10nm', '25nm', '100nm', '250nm', '1um')
+_OLIGO_DILUTION_VOLUMES = ((60, 250, 1000, 2500, 10000),
+                           (6, 25, 100, 250, 1000))
+_OLIGO_CONCENTRATION_INDEX = dict(
+    (c, i) for i, c in enumerate(_OLIGO_CONCENTRATIONS))
+_OLIGO_SCALE_INDEX = dict((sc, i) for i, sc in enumerate(_OLIGO_SCALES))
+# Concentration (uM) of the table row other concentrations are scaled from
+_OLIGO_BASE_CONCENTRATION_UM = 100.0
 
 
 def oligo_dilution_table(conc=None, sc=None):
@@ -120,32 +219,109 @@ def oligo_dilution_table(conc=None, sc=None):
         If sc is is not a valid scale: '10nm', '25nm', '100nm', '250nm', '1um'
 
     """
-    concentration = '100uM', '1mM'
-    scale = '10nm', '25nm', '100nm', '250nm', '1um'
-    volumes = [60, 250, 1000, 2500, 10000, 6, 25, 100, 250, 1000]
-
     if conc:
-        assert conc in concentration, ("conc has to be in %s " % concentration)
+        assert conc in _OLIGO_CONCENTRATION_INDEX, (
+            "conc has to be in %s " % (_OLIGO_CONCENTRATIONS,))
     if sc:
-        assert sc in scale, ("sc has to be in %s " % scale)
+        assert sc in _OLIGO_SCALE_INDEX, (
+            "sc has to be in %s " % (_OLIGO_SCALES,))
 
+    if conc and sc:
+        return _OLIGO_DILUTION_VOLUMES[
+            _OLIGO_CONCENTRATION_INDEX[conc]][_OLIGO_SCALE_INDEX[sc]]
+
+    concs = [conc] if conc else _OLIGO_CONCENTRATIONS
+    scales = [sc] if sc else _OLIGO_SCALES
     dilution_table = {}
-    for i, y in enumerate(concentration):
-        dilution_table[y] = dict(
-            zip(scale, volumes[i * len(scale):i * len(scale) + len(scale)]))
+    for c in concs:
+        row = _OLIGO_DILUTION_VOLUMES[_OLIGO_CONCENTRATION_INDEX[c]]
+        dilution_table[c] = dict(
+            (x, row[_OLIGO_SCALE_INDEX[x]]) for x in scales)
 
-    if conc and sc:
-        return dilution_table[conc][sc]
-    elif conc:
+    if conc:
         return dilution_table[conc]
-    elif sc:
-        for x in scale:
-            if sc != x:
-                for c in dilution_table:
-                    dilution_table[c].pop(x, None)
-        return dilution_table
+    return dilution_table
+
+
+def _oligo_dilution_row(conc):
+    if conc in _OLIGO_CONCENTRATION_INDEX:
+        return _OLIGO_DILUTION_VOLUMES[_OLIGO_CONCENTRATION_INDEX[conc]]
+    molar = Unit.fromstring(conc)
+    if str(molar.dimensionality) != '[substance] / [length] ** 3':
+        raise ValueError("Oligo concentration %s has to be a molar "
+                         "concentration" % conc)
+    conc_um = float(molar.to("micromolar").magnitude)
+    if conc_um <= 0:
+        raise ValueError("Oligo concentration %s has to be positive" % conc)
+    factor = _OLIGO_BASE_CONCENTRATION_UM / conc_um
+    return tuple(v * factor for v in _OLIGO_DILUTION_VOLUMES[0])
+
+
+def oligo_dilution_volumes(scales, conc='100uM'):
+    """Return diluent volumes for a whole oligo order
+
+    Batch version of `oligo_dilution_table`. Concentrations other than
+    '100uM' and '1mM' are supported by scaling the table linearly.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol_utilities import oligo_dilution_volumes
+
+        oligo_dilution_volumes(["10nm", "25nm", "1um"])
+        oligo_dilution_volumes(["25nm", "25nm"], ["1mM", "50:micromolar"])
+
+    Returns:
+
+    .. code-block:: python
+
+        [60, 250, 10000]
+        [25, 500.0]
+
+    Parameters
+    ----------
+    scales : list
+        Scales of the oligos: '10nm', '25nm', '100nm', '250nm' or '1um'.
+    conc : str, Unit, list, optional
+        Concentration to resuspend to, for all oligos or one per oligo.
+        Either '100uM', '1mM' or any molar concentration such as
+        '50:micromolar'. Default: '100uM'.
+
+    Returns
+    -------
+    list
+        Diluent volume in microliters for every oligo. Volumes for
+        concentrations outside the table are floats.
+
+    Raises
+    ------
+    ValueError
+        If a scale is not valid
+    ValueError
+        If a concentration is not a positive molar concentration
+    ValueError
+        If conc is a list of different length than scales
+
+    """
+    if isinstance(conc, (list, tuple)):
+        assert len(conc) == len(scales), (
+            "oligo_dilution_volumes: conc and scales have to be of equal "
+            "length")
+        concs = conc
     else:
-        return dilution_table
+        concs = [conc] * len(scales)
+
+    rows = {}
+    volumes = []
+    for sc, c in zip(scales, concs):
+        assert sc in _OLIGO_SCALE_INDEX, (
+            "sc has to be in %s " % (_OLIGO_SCALES,))
+        key = str(c)
+        if key not in rows:
+            rows[key] = _oligo_dilution_row(c)
+        volumes.append(rows[key][_OLIGO_SCALE_INDEX[sc]])
+    return volumes
 
 
 def return_agar_plates(wells=6):
@@ -165,24 +341,14 @@ def return_agar_plates(wells=6):
     Raises
     ------
     ValueError
-        If wells is not a integer equal to 1 or 6
+        If wells is not a integer equal to 1 or 6 (or another plate size
+        listed in the active catalog)
 
     """
-    if wells == 6:
-        plates = {"lb_miller_50ug_ml_kan": "ki17rs7j799zc2",
-                  "lb_miller_100ug_ml_amp": "ki17sbb845ssx9",
-                  "lb_miller_100ug_ml_specto": "ki17sbb9r7jf98",
-                  "lb_miller_100ug_ml_cm": "ki17urn3gg8tmj",
-                  "lb_miller_noAB": "ki17reefwqq3sq"}
-    elif wells == 1:
-        plates = {"lb_miller_50ug_ml_kan": "ki17t8j7kkzc4g",
-                  "lb_miller_100ug_ml_amp": "ki17t8jcebshtr",
-                  "lb_miller_100ug_ml_specto": "ki17t8jaa96pw3",
-                  "lb_miller_100ug_ml_cm": "ki17urn592xejq",
-                  "lb_miller_noAB": "ki17t8jejbea4z"}
-    else:
-        raise ValueError("Wells has to be an integer, either 1 or 6")
-    return (plates)
+    if wells not in _AGAR_PLATES:
+        raise ValueError("Wells has to be an integer, one of %s" %
+                         ", ".join(str(w) for w in sorted(_AGAR_PLATES)))
+    return dict(_AGAR_PLATES[wells])
 
 
 def return_dispense_media():
@@ -279,18 +445,7 @@ def return_dispense_media():
 
 
     """
-    media = {"50_ug/ml_Kanamycin": "lb_miller_50ug_ml_kan",
-             "100_ug/ml_Ampicillin": "lb_miller_100ug_ml_amp",
-             "100_ug/mL_Spectinomycin": "lb_miller_100ug_ml_specto",
-             "30_ug/ml_Kanamycin": "lb_miller_30ug_ml_kan",
-             "15_ug/ml_Tetracycline": "lb_miller_15ug_ml_tet",
-             "50_ug/ml_Kanamycin_25_ug/ml_Chloramphenicol":
-             "lb_miller_50ug_ml_kan_25ug_ml_cm",
-             "25_ug/ml_Chloramphenicol": "lb_miller_25ug_ml_cm",
-             "LB_miller": "lb_miller_noAB",
-             "TB_100_ug/ml_Ampicillin": "tb_100ug_ml_amp",
-             "TB_50_ug/ml_Kanamycin": "tb_50ug_ml_kan"}
-    return (media)
+    return dict(_DISPENSE_MEDIA)
 
 
 def ref_kit_container(protocol, name, container, kit_id, discard=True,
@@ -348,6 +503,238 @@ def ref_kit_container(protocol, name, container, kit_id, discard=True,
     return kit_item
 
 
+def ref_kit_containers(protocol, names, container, kit_id, discard=True,
+                       store=None):
+    """Reserve many agar plates for use within a protocol.
+
+    Bulk version of `ref_kit_container`. The container type is resolved
+    once and all containers are booked in one pass. `kit_id` can also be
+    an agar plate name from `return_agar_plates`, in which case the kit id
+    matching the well count of the container type is used.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import ref_kit_containers
+
+        p = Protocol()
+        plates = ref_kit_containers(p, 96, "6-flat", "lb_miller_50ug_ml_kan",
+                                    discard=False, store="cold_4")
+        plates[0].name
+
+    Returns:
+
+    .. code-block:: python
+
+        'lb_miller_50ug_ml_kan_0'
+
+    Parameters
+    ----------
+    protocol : Protocol
+        instance of protocol.
+    names : list, int
+        Names for the plates. If an integer is given, that many plates are
+        booked and named after the kit with the plate number appended.
+    container : str
+        Container type name.
+    kit_id : str
+        Kit item to be created or agar plate name from `return_agar_plates`.
+    discard : bool
+        Determine if plates are discarded after use.
+    store : str
+        If the plates are not discarded, indicate valid storage condition.
+
+    Returns
+    -------
+    list
+        List of Containers in the order of `names`
+
+    Raises
+    ------
+    ValueError
+        If names are not unique or already used in the protocol
+
+    """
+    cont_type = protocol.container_type(container)
+    kit_name = kit_id
+    kit_id = _AGAR_PLATES.get(cont_type.well_count, {}).get(kit_id, kit_id)
+    if isinstance(names, int):
+        names = ["%s_%s" % (kit_name, i) for i in range(names)]
+    assert len(set(names)) == len(names), (
+        "ref_kit_containers: names have to be unique")
+    for name in names:
+        assert name not in protocol.refs, (
+            "ref_kit_containers: %s is already used in this protocol" % name)
+
+    if store:
+        opts = {"reserve": kit_id, "store": {"where": store}}
+    else:
+        opts = {"reserve": kit_id, "discard": discard}
+    storage = store if store else None
+
+    refs = protocol.refs
+    kit_items = []
+    for name in names:
+        kit_item = Container(None, cont_type, name, storage=storage)
+        refs[name] = Ref(name, dict(opts), kit_item)
+        kit_items.append(kit_item)
+    return kit_items
+
+
+ReagentUsage = namedtuple('ReagentUsage', 'resource_id name volume '
+                          'containers dead_volume total')
+
+
+def reagent_consumption(protocol, source_type="micro-1.5"):
+    """Total the reagents a protocol consumes for provisioning
+
+    Makes one pass over the instructions of a protocol and sums the volume
+    of every reagent provisioned or dispensed, by resource id. Dispensed
+    volumes count once per row of the dispensed column. Dead volume is
+    added for every source container of `source_type` needed to hold the
+    reagent.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import ResourceIDs, reagent_consumption
+
+        p = Protocol()
+        plate = p.ref("plate", None, "96-flat", discard=True)
+        water = ResourceIDs().water
+        p.provision(water, plate.wells_from(0, 10), "100:microliter")
+        p.dispense_full_plate(plate, water, "10:microliter",
+                              is_resource_id=True)
+        reagent_consumption(p)
+
+    Returns:
+
+    .. code-block:: python
+
+        [ReagentUsage(resource_id='rs17gmh5wafm5p', name='water',
+                      volume=1960.0, containers=2, dead_volume=30.0,
+                      total=1990.0)]
+
+    Parameters
+    ----------
+    protocol : Protocol, list
+        Protocol or list of its instructions
+    source_type : str, dict, optional
+        Container type shortname the reagents are provisioned from, or a
+        dict with resource ids as keys and shortnames as values. Resource
+        ids not in the dict use micro-1.5.
+
+    Returns
+    -------
+    list
+        ReagentUsage namedtuples in the order of first use. Volumes are
+        floats in microliters, `name` is the `ResourceIDs` name or None.
+        Dispenses of reagents without resource id are listed with the
+        reagent as `resource_id`.
+
+    Raises
+    ------
+    ValueError
+        If source_type is not a known container type
+
+    """
+    instructions = getattr(protocol, "instructions", protocol)
+    volumes = {}
+    order = []
+    unit_cache = {}
+
+    def microliters(volume):
+        key = str(volume)
+        if key not in unit_cache:
+            unit_cache[key] = float(
+                Unit.fromstring(volume).to("microliter").magnitude)
+        return unit_cache[key]
+
+    for instruction in instructions:
+        data = instruction.data
+        if instruction.op == "provision":
+            rid = data["resource_id"]
+            used = sum(microliters(t["volume"]) for t in data["to"])
+        elif instruction.op == "dispense":
+            rid = data.get("resource_id", data.get("reagent"))
+            rows = _container_info(data["object"]).rows
+            used = rows * sum(microliters(c["volume"])
+                              for c in data["columns"])
+        else:
+            continue
+        if rid not in volumes:
+            volumes[rid] = 0.0
+            order.append(rid)
+        volumes[rid] += used
+
+    if not isinstance(source_type, dict):
+        source_type = dict((rid, source_type) for rid in order)
+    usage = []
+    for rid in order:
+        shortname = source_type.get(rid, "micro-1.5")
+        info = _container_info(shortname)
+        assert info is not None, (
+            "reagent_consumption: unknown container type %s" % shortname)
+        dead = info.dead_volume_ul
+        capacity = info.well_volume_ul - dead
+        containers = int(math.ceil(volumes[rid] / capacity))
+        usage.append(ReagentUsage(
+            resource_id=rid, name=_RESOURCE_NAMES.get(rid),
+            volume=volumes[rid], containers=containers,
+            dead_volume=containers * dead,
+            total=volumes[rid] + containers * dead))
+    return usage
+
+
+# Active catalog indexes, filled by `load_catalog`
+# Resource name to resource id
+_RESOURCE_IDS = {}
+# Resource id to resource name
+_RESOURCE_NAMES = {}
+# Number of wells to agar plate name to kit id
+_AGAR_PLATES = {}
+# Media display name to media name
+_DISPENSE_MEDIA = {}
+
+# Restriction buffer name to buffer resource name and digestable enzymes
+_RESTRICTION_BUFFERS = {
+    "cutsmart": ("cutsmart_buffer", [
+        "pvuii_hf", "ecori_hf", "hindiii_hf", "bamhi_hf", "psti_hf",
+        "ncoi_hf", "xbai", "bsai", "ndei", "xhoi", "smai", "bbvCi",
+        "dpni_neb", "mfei_hf"]),
+    "neb_21": ("neb21_buffer", ["bbsi"]),
+    "new_31": ("neb31_buffer", ["bsmbi", "sali", "hincii"]),
+    "fast_digest": ("fastdigest_buffer", ["esp3i"])
+}
+
+# Enzyme resource name to buffer resource name
+_ENZYME_BUFFERS = dict((enzyme, buf)
+                       for buf, enzymes in _RESTRICTION_BUFFERS.values()
+                       for enzyme in enzymes)
+
+# Display names to resource names for the ResourceIDs lookup methods
+_BACTERIA = {"Zymo 10B": "zymo_10b",
+             "Zymo DH5a": "zymo_dh5a",
+             "Zymo JM109": "zymo_jm109"}
+_DILUENTS = {"water": "water",
+             "TE": "te"}
+_TRANSFORMATION_CONTROLS = {"lb_miller_50ug_ml_kan": "control_kan",
+                            "lb_miller_100ug_ml_amp": "control_amp"}
+_GROWTH_MEDIA = {"lb_miller_50ug_ml_kan": "lb_miller_50ug_ml_kan",
+                 "lb_miller_100ug_ml_amp": "lb_miller_100ug_ml_amp",
+                 "lb_miller_noAB": "lb_miller_noAB"}
+_T4_LIGASES = {"neb": {"buffer": "neb_t4ligase_buffer",
+                       "ligase": "neb_t4ligase"},
+               "thermo": {"buffer": "thermo_t4ligase_buffer",
+                          "ligase": "thermo_t4ligase"}}
+
+RestrictionSet = namedtuple('RestrictionSet', 'enzyme_id buffer_id errors')
+
+
 class ResourceIDs(object):
 
     """Common resource ids
@@ -355,6 +742,11 @@ class ResourceIDs(object):
     A list of resource identification numbers used to provision
     resources using Autoprotocol.
 
+    The resource ids are loaded from the resource catalog (see
+    `load_catalog`) into a module level registry. `ResourceIDs()`
+    always returns the same read-only instance, so creating it is free and
+    every lookup is a dict lookup.
+
     Example
     -------
 
@@ -376,6 +768,7 @@ class ResourceIDs(object):
         res.phusion_poly
         res.orange_g_100
         res.orange_g_500
+        res.resource_name("rs17gmh5wafm5p")
 
     Returns
     -------
@@ -384,123 +777,29 @@ class ResourceIDs(object):
 
     """
 
-    def __init__(self):
-        # diluent
-        self.water = "rs17gmh5wafm5p"
-        self.te = "rs17pwyc754v9t"
-        # competent cells
-        self.zymo_10b = "rs16pbjc4r7vvz"
-        self.zymo_dh5a = "rs16pbj944fnny"
-        self.zymo_jm109 = "rs16pbjdhwkjxy"
-        # antibiotics
-        self.ampicillin_100mg_ml = "rs17msfk8ujkca"
-        self.chloramphenicol_34mg_ml = "rs17p6t8ty2ny4"
-        self.kanamycin_50mg_ml = "rs17msfpgpbqyv"
-        # media
-        self.lb_miller_50ug_ml_kan = "rs18s8x88zz9ee"
-        self.lb_miller_100ug_ml_amp = "rs18s8x4qbsvjz"
-        self.lb_miller_noAB = "rs17bafcbmyrmh"
-        # kunkel resources
-        self.t7_poly = "rs16pca2urcz74"
-        self.t4_pnk = "rs16pc9rd5hsf6"
-        self.t4_pnk_buffer = "rs16pc9rd5sg5d"
-        self.atp_100mM = "rs16pccshb6cb4"
-        # SYBR green qPCR enzyme
-        self.sensifast = "rs17knkh7526ha"
-        self.itaq = "rs18fabf4h5se8"
-        # mytaq dna polymerase resources
-        self.mytaq_poly = "rs16pcbhquhaz3"
-        self.mytaq_red_poly = "rs16r3h6umutcg"
-        self.mytaq_hs_red_mix = "rs17kj4vnh5xm3"
-        self.mytaq_red_mix = "rs17kj4j9vgh4x"
-        self.mytaq_buffer = "rs16pcbhqurzpa"
-        # phusion dna polymerase resources
-        self.phusion_poly = "rs16pcc3mgay64"
-        self.phusion_mgcl_50 = "rs16pcc3mgzy4r"
-        self.phusion_gc_buffer = "rs16pcc3mgs9eh"
-        self.phusion_hf_buffer = "rs16pcc3mgjnub"
-        # kapa dna polymerase master mixes
-        self.kapa_hifi_hs_mix = "rs18esg5hz25cm"
-        self.kapa_2g_hs_mix = "rs18esfy3xqvut"
-        # velocity dna polymerase resources
-        self.velocity_poly = "rs16pcckjgaxdt"
-        self.velocity_hifi_buffer = "rs16pcckjghhyz"
-        self.velocity_mgcl = "rs16pcckjgs8p8"
-        self.velocity_dmso = "rs16pcckjgyu9e"
-        # la taq dna polymerase resources
-        self.lataq_poly = "rs16pcbdc5dfw6"
-        self.lataq_poly_gc1 = "rs16pcb53zwxjz"
-        self.la_buffer_2_10x = "rs16pcbdc5n6kd"
-        self.lataq_poly_gc = "rs16pcb53zp8vs"
-        self.lataq_poly_gc2 = "rs16pcb5425j67"
-        self.lataq_dntp25 = "rs16pcbdc5us6k"
-        # pcr components
-        self.dntps_25 = "rs16pcb542c5rd"
-        self.dntps_10 = "rs186wj7fvknsr"
-        self.mgcl = "rs16pca93rjwgq"
-        self.dmso = "rs186hr8m38ntw"
-        # restriction enzymes
-        #  buffers
-        self.cutsmart_buffer = "rs17ta93g3y85t"
-        self.neb21_buffer = "rs17sh6krrzjqu"
-        self.neb31_buffer = "rs18jwyqebdsdu"
-        self.fastdigest_buffer = "rs18a8uvv7us8t"
-        #  enzymes
-        self.ncoi_hf = "rs183kfrjt4svz"
-        self.psti_hf = "rs17usrub943jf"
-        self.ecori_hf = "rs17ta8xftpdk6"
-        self.bamhi_hf = "rs17ta8tz5ffby"
-        self.bbsi = "rs17rrdaz88sz5"
-        self.bsmbi = "rs17px7f9yg3kn"
-        self.pvuii_hf = "rs17ta9v88fgpd"
-        self.bsai = "rs17px78jjr2fq"
-        self.ndei = "rs186h3y9nuqzb"
-        self.xhoi = "rs186h4bcgjtyu"
-        self.dpni_neb = "rs18kfcmf5xvxz"
-        self.mfei_hf = "rs18nw6ta6d5bn"
-        self.esp3i = "rs18a8ttpm8hxk"
-        self.hindiii_hf = "rs18nw6kpnp44v"
-        self.sali = "rs18trptum9gc4"
-        self.smai = "rs18vvr4tgrghh"
-        self.xbai = "rs18x6ja5k75ev"
-        self.hincii = "rs18x6jrxfxtut"
-        self.bbvCi = "rs18x6k25qmr6k"
-        # orange g
-        self.orange_g_100 = "rs17zw9zsaqd55"
-        self.organge_g_500 = "rs17zwe6rux5b7"
-        # control plasmids
-        self.control_amp = "rs18rx59spw2t8"
-        self.control_kan = "rs18rx6a44qss7"
-        # ligases
-        self.thermo_t4ligase_buffer = "rs16pc8u4dmsbg"
-        self.thermo_t4ligase = "rs16pc8u4dd3n9"
-        self.neb_t4ligase_buffer = "rs17sh5rzz79ct"
-        self.neb_t4ligase = "rs16pc8krr6ag7"
-        self.ligase_control = "rs18sfjf96tkwe"
-        # other
-        self.exosap = "rs18dnrskds4t6"
-        # assembly reagents
-        self.nebuilder2x = "rs18pc86ykcep6"
-        self.nebuilderpc = "rs192pqa2jua9v"
-        self.gibson2x = "rs16pfatkggmk5"
-        self.gibsonpc = "rs1959tbv27xu2"
-        self.infusion5x = "rs16pfv7qw5ytj"
-        self.infusionpuc = "rs192pqw2nuef8"
-        self.infusioninsert = "rs192pqxnx9gm2"
-        # QuantIt
-        self.quantItLambda = "rs18qstca8ksrt"
-        self.quantItTE = "rs18qst9znacdy"
-        self.quantItPico = "rs18qst83met3g"
-        # MagJet
-        self.lysozyme = "rs18u5sv3y8haj"
-        self.dtt = "rs18umvdgu69su"
-        self.MagJETRNALysisBuffer = "rs18umvv99scva"
-        self.MagJETRNABeads = "rs18umvxjtubpw"
-        self.MagJETRNAReactionBuffer = "rs18umwewhmmvr"
-        self.MagJETRNADNase = "rs18umwj7mmmdc"
-        # genotyping lysis buffers
-        self.geno_lysis = "rs17krffpwfyrq"
-        self.geno_neut = "rs17krfgz55nqq"
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResourceIDs, cls).__new__(cls)
+        return cls._instance
+
+    def resource_name(self, resource_id):
+        """Return the name of a resource id
+
+        Parameters
+        ----------
+        resource_id: string
+            Resource id such as `rs17gmh5wafm5p`
+
+        Returns
+        -------
+        string
+            name of the resource (the `ResourceIDs` attribute), `None` if
+            the resource id could not be found
+        """
+        return _RESOURCE_NAMES.get(resource_id)
 
     def bacteria(self, bact=None):
         """Return competent bacteria id
@@ -516,10 +815,7 @@ class ResourceIDs(object):
             resource id for the bacteria requested, `None` if bact could not
             be found
         """
-        bacteria = {"Zymo 10B": self.zymo_10b,
-                    "Zymo DH5a": self.zymo_dh5a,
-                    "Zymo JM109": self.zymo_jm109}
-        return bacteria.get(bact)
+        return _RESOURCE_IDS.get(_BACTERIA.get(bact))
 
     def diluents(self, dil=None):
         """Return diluent id
@@ -535,9 +831,7 @@ class ResourceIDs(object):
             resource id for the diluent requested, `None` if dil could not
             be found
         """
-        diluents = {"water": self.water,
-                    "TE": self.te}
-        return diluents.get(dil)
+        return _RESOURCE_IDS.get(_DILUENTS.get(dil))
 
     def exoassembly_kits(self, kit=None):
         kit_dict = {"NEBuilder": {"name": "NEBuilder",
@@ -570,9 +864,7 @@ class ResourceIDs(object):
             resource id for the positive control requested, `None` if media
             could not be found
         """
-        controls = {"lb_miller_50ug_ml_kan": self.control_kan,
-                    "lb_miller_100ug_ml_amp": self.control_amp}
-        return controls.get(media)
+        return _RESOURCE_IDS.get(_TRANSFORMATION_CONTROLS.get(media))
 
     def growth_media(self, media=None):
         """Return growth media resource id
@@ -588,12 +880,7 @@ class ResourceIDs(object):
             resource id for the media requested, `None` if media
             could not be found
         """
-        media_dict = {
-            "lb_miller_50ug_ml_kan": self.lb_miller_50ug_ml_kan,
-            "lb_miller_100ug_ml_amp": self.lb_miller_100ug_ml_amp,
-            "lb_miller_noAB": self.lb_miller_noAB
-        }
-        return media_dict.get(media)
+        return _RESOURCE_IDS.get(_GROWTH_MEDIA.get(media))
 
     def t4_ligase(self, ligase_type=None):
         """Return T4 ligase reagents
@@ -610,11 +897,10 @@ class ResourceIDs(object):
             'ligase' - resource id for the ligase
 
         """
-        ligases = {"neb": {"buffer": self.neb_t4ligase_buffer,
-                           "ligase": self.neb_t4ligase},
-                   "thermo": {"buffer": self.thermo_t4ligase_buffer,
-                              "ligase": self.thermo_t4ligase}}
-        return ligases.get(ligase_type)
+        if ligase_type not in _T4_LIGASES:
+            return None
+        return dict((k, _RESOURCE_IDS[v])
+                    for k, v in _T4_LIGASES[ligase_type].items())
 
     def restriction_enzyme_buffers(self, enzyme):
         """Returns a tuple of enzyme_id and buffer_id for a given enzyme
@@ -634,56 +920,183 @@ class ResourceIDs(object):
             enzyme_id, buffer_id, errors
         """
         em = []
-        resset = namedtuple('RestrictionSet', 'enzyme_id buffer_id errors')
-
-        enzymes = {"ncoi_hf": self.ncoi_hf,
-                   "psti_hf": self.psti_hf,
-                   "ecori_hf": self.ecori_hf,
-                   "bamhi_hf": self.bamhi_hf,
-                   "bbsi": self.bbsi,
-                   "bsmbi": self.bsmbi,
-                   "pvuii_hf": self.pvuii_hf,
-                   "bsai": self.bsai,
-                   "ndei": self.ndei,
-                   "xhoi": self.xhoi,
-                   "dpni_neb": self.dpni_neb,
-                   "mfei_hf": self.mfei_hf,
-                   "esp3i": self.esp3i,
-                   "hindiii_hf": self.hindiii_hf,
-                   "sali": self.sali,
-                   "smai": self.smai,
-                   "bbvCi": self.bbvCi,
-                   "xbai": self.xbai,
-                   "hincii": self.hincii}
-
-        buffer_map = {}
-        buffer_map["cutsmart"] = {
-            "buffer_id": self.cutsmart_buffer, "enzymes": [
-                "pvuii_hf", "ecori_hf", "hindiii_hf",
-                "bamhi_hf", "psti_hf", "ncoi_hf", "xbai",
-                "bsai", "ndei", "xhoi", "smai", "bbvCi",
-                "dpni_neb", "mfei_hf"]}
-        buffer_map["neb_21"] = {
-            "buffer_id": self.neb21_buffer, "enzymes": ["bbsi"]}
-        buffer_map["new_31"] = {
-            "buffer_id": self.neb31_buffer, "enzymes": [
-                "bsmbi", "sali", "hincii"]}
-        buffer_map["fast_digest"] = {
-            "buffer_id": self.fastdigest_buffer, "enzymes": ["esp3i"]}
-
-        enzyme_id = enzymes.get(enzyme, None)
+        enzyme_id = None
+        buffer_id = None
+        if enzyme in _ENZYME_BUFFERS:
+            enzyme_id = _RESOURCE_IDS[enzyme]
+            buffer_id = _RESOURCE_IDS[_ENZYME_BUFFERS[enzyme]]
         if not enzyme_id:
             em.append("The enzyme (%s) cannot be found." % enzyme)
-        buffer_id = None
-        for resbuffer in buffer_map.values():
-            if enzyme in resbuffer["enzymes"]:
-                buffer_id = resbuffer["buffer_id"]
         if not buffer_id:
             em.append("The enzyme specified (%s) doesn't have a corresponding"
                       " buffer." % enzyme)
 
-        em = [_f for _f in em if _f]
         if len(em) == 0:
             em = None
 
-        return resset(enzyme_id=enzyme_id, buffer_id=buffer_id, errors=em)
+        return RestrictionSet(enzyme_id=enzyme_id, buffer_id=buffer_id,
+                              errors=em)
+
+
+Catalog = namedtuple('Catalog',
+                     'version resource_ids agar_plates dispense_media')
+
+# Catalog shipped with the package
+_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "resources.json")
+# Environment variable pointing to a site specific catalog
+_CATALOG_ENV = "AUTOPROTOCOL_UTILITIES_CATALOG"
+_CATALOG_VERSION = 1
+# Compiled catalogs keyed by the sha1 of the catalog file
+_compiled_catalogs = {}
+_catalog_lock = threading.Lock()
+
+
+def _replace_items(target, items):
+    # update first, then drop stale keys, so readers never see it empty
+    target.update(items)
+    for key in [k for k in target if k not in items]:
+        del target[key]
+
+
+def _validate_mapping(mapping, section, path):
+    if not isinstance(mapping, dict):
+        raise ValueError("Catalog %s: '%s' has to be a mapping" %
+                         (path, section))
+    for key, value in mapping.items():
+        if not (isinstance(key, string_type) and
+                isinstance(value, string_type)):
+            raise ValueError("Catalog %s: '%s' entry %r has to map a string "
+                             "to a string" % (path, section, key))
+
+
+def _compile_catalog(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    if digest in _compiled_catalogs:
+        return _compiled_catalogs[digest]
+
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise ValueError("Catalog %s is not valid JSON: %s" % (path, e))
+    if not isinstance(data, dict):
+        raise ValueError("Catalog %s has to be a JSON object" % path)
+    if data.get("version") != _CATALOG_VERSION:
+        raise ValueError("Catalog %s has version %r, only version %s is "
+                         "supported" % (path, data.get("version"),
+                                        _CATALOG_VERSION))
+    unknown = set(data) - set(Catalog._fields)
+    if unknown:
+        raise ValueError("Catalog %s has unknown sections: %s" %
+                         (path, ", ".join(sorted(unknown))))
+
+    resource_ids = data.get("resource_ids", {})
+    _validate_mapping(resource_ids, "resource_ids", path)
+    dispense_media = data.get("dispense_media", {})
+    _validate_mapping(dispense_media, "dispense_media", path)
+    agar_plates = {}
+    if not isinstance(data.get("agar_plates", {}), dict):
+        raise ValueError("Catalog %s: 'agar_plates' has to be a mapping" %
+                         path)
+    for wells, plates in data.get("agar_plates", {}).items():
+        try:
+            wells = int(wells)
+        except ValueError:
+            raise ValueError("Catalog %s: 'agar_plates' keys have to be well "
+                             "counts, not %r" % (path, wells))
+        _validate_mapping(plates, "agar_plates/%s" % wells, path)
+        agar_plates[wells] = dict(plates)
+
+    catalog = Catalog(version=data["version"],
+                      resource_ids=dict(resource_ids),
+                      agar_plates=agar_plates,
+                      dispense_media=dict(dispense_media))
+    _compiled_catalogs[digest] = catalog
+    return catalog
+
+
+def load_catalog(path=None):
+    """Load the resource catalog
+
+    Resource ids, agar plate kit ids and dispense media are read from a
+    versioned JSON catalog instead of being hardcoded. The catalog shipped
+    with this package is always loaded first. A site specific catalog given
+    by `path`, or by the `AUTOPROTOCOL_UTILITIES_CATALOG` environment
+    variable, is loaded on top of it and overrides or adds entries.
+
+    The catalog in the environment variable is loaded on import. Each file
+    is validated and compiled once per content, so reloading an unchanged
+    catalog is cheap.
+
+    Example catalog:
+
+    .. code-block:: json
+
+        {
+            "version": 1,
+            "resource_ids": {"water": "rs17gmh5wafm5p"},
+            "agar_plates": {"6": {"lb_miller_noAB": "ki17reefwqq3sq"}},
+            "dispense_media": {"LB_miller": "lb_miller_noAB"}
+        }
+
+    Parameters
+    ----------
+    path : str, optional
+        Path to a site specific catalog. Defaults to the value of the
+        `AUTOPROTOCOL_UTILITIES_CATALOG` environment variable.
+
+    Returns
+    -------
+    namedtuple
+        The active `Catalog` with `version`, `resource_ids`, `agar_plates`
+        and `dispense_media`
+
+    Raises
+    ------
+    ValueError
+        If a catalog is not valid JSON, has an unsupported version or has
+        malformed sections
+    IOError
+        If a catalog file cannot be read
+
+    """
+    catalogs = [_compile_catalog(_CATALOG_PATH)]
+    path = path or os.environ.get(_CATALOG_ENV)
+    if path:
+        catalogs.append(_compile_catalog(path))
+
+    resource_ids = {}
+    agar_plates = {}
+    dispense_media = {}
+    for catalog in catalogs:
+        resource_ids.update(catalog.resource_ids)
+        for wells, plates in catalog.agar_plates.items():
+            agar_plates.setdefault(wells, {}).update(plates)
+        dispense_media.update(catalog.dispense_media)
+
+    with _catalog_lock:
+        for name in resource_ids:
+            if name.startswith("_") or (hasattr(ResourceIDs, name) and
+                                        name not in _RESOURCE_IDS):
+                raise ValueError(
+                    "Catalog resource name %s is reserved" % name)
+
+        for name, resource_id in resource_ids.items():
+            setattr(ResourceIDs, name, resource_id)
+        for name in [n for n in _RESOURCE_IDS if n not in resource_ids]:
+            delattr(ResourceIDs, name)
+        _replace_items(_RESOURCE_IDS, resource_ids)
+        _replace_items(_RESOURCE_NAMES,
+                       dict((v, k) for k, v in resource_ids.items()))
+        _replace_items(_AGAR_PLATES, agar_plates)
+        _replace_items(_DISPENSE_MEDIA, dispense_media)
+
+    return Catalog(version=_CATALOG_VERSION, resource_ids=dict(resource_ids),
+                   agar_plates=dict((w, dict(p))
+                                    for w, p in agar_plates.items()),
+                   dispense_media=dict(dispense_media))
+
+
+load_catalog()
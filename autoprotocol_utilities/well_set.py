@@ -0,0 +1,224 @@
+from autoprotocol.container import Container, WellGroup, Well
+
+
+class WellSet(object):
+    """Set of wells of one container stored as a bitset
+
+    Bit `i` is set if well index `i` is in the set. Union (`|`),
+    intersection (`&`), difference (`-`) and symmetric difference (`^`)
+    work on whole machine words of the bitset instead of on lists of
+    wells. WellSets serialize to a compact run-length encoded string of
+    index ranges for logs and convert to and from WellGroups.
+
+    `binary_list`, `get_quadrant_binary_list` and `stamp_shape` accept a
+    WellSet in place of a list of wells.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        from autoprotocol import Protocol
+        from autoprotocol_utilities import WellSet
+
+        p = Protocol()
+        plate = p.ref("plate", None, "96-flat", discard=True)
+        samples = WellSet.from_wells(plate.wells_from(0, 24))
+        controls = WellSet(plate, range(20, 30))
+        (samples - controls).to_rle()
+        (samples & controls).wells()
+
+    Returns:
+
+    .. code-block:: python
+
+        '0-19'
+        WellGroup([
+            Well(Container(plate), 20, None),
+            Well(Container(plate), 21, None),
+            Well(Container(plate), 22, None),
+            Well(Container(plate), 23, None)
+        ])
+
+    Parameters
+    ----------
+    container: Container
+        Container the wells belong to
+    wells: int, list, WellGroup, optional
+        Bitmask of well indices, or wells or well indices in the set
+
+    Raises
+    ------
+    ValueError
+        If container is not a Container
+    ValueError
+        If wells are not from `container` or indices are out of range
+
+    """
+    __slots__ = ('container', 'bits')
+
+    def __init__(self, container, wells=None):
+        assert isinstance(container, Container), (
+            "WellSet: container must be of type Container")
+        well_count = container.container_type.well_count
+        bits = 0
+        if isinstance(wells, int):
+            bits = wells
+        elif wells is not None:
+            for well in wells:
+                if isinstance(well, Well):
+                    assert well.container is container, (
+                        "WellSet: wells have to come from %s" % container)
+                    well = well.index
+                bits |= 1 << well
+        assert bits >> well_count == 0 and bits >= 0, (
+            "WellSet: well indices have to be below %s" % well_count)
+        self.container = container
+        self.bits = bits
+
+    @classmethod
+    def from_wells(cls, wells):
+        """Create a WellSet from wells of one container
+
+        Parameters
+        ----------
+        wells: Well, list, WellGroup
+            Wells of one container
+
+        Returns
+        -------
+        WellSet
+
+        """
+        if isinstance(wells, Well):
+            wells = [wells]
+        assert len(wells) > 0, "WellSet: at least one well is needed"
+        return cls(wells[0].container, wells)
+
+    @classmethod
+    def from_rle(cls, container, rle):
+        """Create a WellSet from the string written by `to_rle`
+
+        Parameters
+        ----------
+        container: Container
+            Container the wells belong to
+        rle: str
+            Comma separated well indices and index ranges, e.g. `0-11,24`
+
+        Returns
+        -------
+        WellSet
+
+        """
+        bits = 0
+        for run in rle.split(","):
+            if not run:
+                continue
+            start, _, end = run.partition("-")
+            start = int(start)
+            end = int(end) if end else start
+            bits |= ((1 << (end - start + 1)) - 1) << start
+        return cls(container, bits)
+
+    def to_rle(self):
+        """Run-length encode the set as comma separated index ranges
+
+        Returns
+        -------
+        str
+            e.g. `0-11,24-35,40` for wells 0 to 11, 24 to 35 and 40
+
+        """
+        runs = []
+        bits = self.bits
+        offset = 0
+        while bits:
+            # skip the gap, then measure the run of set bits
+            gap = (bits & -bits).bit_length() - 1
+            bits >>= gap
+            offset += gap
+            length = (~bits & (bits + 1)).bit_length() - 1
+            if length == 1:
+                runs.append(str(offset))
+            else:
+                runs.append("%d-%d" % (offset, offset + length - 1))
+            bits >>= length
+            offset += length
+        return ",".join(runs)
+
+    def indices(self):
+        """Well indices in the set, in ascending order
+
+        Returns
+        -------
+        list
+
+        """
+        indices = []
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            indices.append(low.bit_length() - 1)
+            bits ^= low
+        return indices
+
+    def wells(self):
+        """Wells in the set, in ascending index order
+
+        Returns
+        -------
+        WellGroup
+
+        """
+        well = self.container.well
+        return WellGroup([well(i) for i in self.indices()])
+
+    def _other(self, other):
+        assert isinstance(other, WellSet) and \
+            other.container is self.container, (
+                "WellSet: sets have to be of the same container")
+        return other.bits
+
+    def __or__(self, other):
+        return WellSet(self.container, self.bits | self._other(other))
+
+    def __and__(self, other):
+        return WellSet(self.container, self.bits & self._other(other))
+
+    def __sub__(self, other):
+        return WellSet(self.container, self.bits & ~self._other(other))
+
+    def __xor__(self, other):
+        return WellSet(self.container, self.bits ^ self._other(other))
+
+    def __contains__(self, well):
+        if isinstance(well, Well):
+            if well.container is not self.container:
+                return False
+            well = well.index
+        return bool(self.bits >> well & 1)
+
+    def __iter__(self):
+        return iter(self.wells())
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __bool__(self):
+        return self.bits != 0
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        return (isinstance(other, WellSet) and
+                other.container is self.container and
+                other.bits == self.bits)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.container), self.bits))
+
+    def __repr__(self):
+        return "WellSet(%s, '%s')" % (self.container, self.to_rle())
@@ -8,6 +8,7 @@ setup(name='autoprotocol_utilities',
       author_email='vanessa@transcriptic.com',
       license='MIT',
       packages=['autoprotocol_utilities'],
+      package_data={'autoprotocol_utilities': ['resources.json']},
       tests_require=['pytest'],
       install_requires=['autoprotocol>=3.7'],
       zip_safe=False)
@@ -0,0 +1,39 @@
+"""Benchmark binary_list against the previous generator implementation
+
+Run from the repository root with `python -m tests.bench_binary_list`.
+"""
+import random
+import timeit
+from autoprotocol_utilities.rectangle import binary_list
+
+
+def generator_binary_list(wells, length=None):
+    # binary_list before it built a list by index, needs sorted wells
+    length = length or max(wells) + 1
+    wells_ptr = 0
+    for i in range(length):
+        try:
+            if wells[wells_ptr] == i:
+                wells_ptr += 1
+                yield 1
+            else:
+                yield 0
+        except IndexError:
+            yield 0
+
+
+def main(number=2000):
+    for length, filled in [(96, 40), (384, 200), (1536, 700)]:
+        wells = sorted(random.sample(range(length), filled))
+        old = timeit.timeit(
+            lambda: [b for b in generator_binary_list(wells, length)],
+            number=number)
+        new = timeit.timeit(lambda: list(binary_list(wells, length)),
+                            number=number)
+        print("%4d wells, %3d filled: generator %.2f ms, indexed %.2f ms "
+              "(%.1fx)" % (length, filled, old * 1000 / number,
+                           new * 1000 / number, old / new))
+
+
+if __name__ == "__main__":
+    main()
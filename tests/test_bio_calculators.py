@@ -1,6 +1,7 @@
 from autoprotocol_utilities.bio_calculators import dna_mass_to_mole, dna_mole_to_mass, \
     molar_to_mass_conc, mass_conc_to_molar, ligation_insert_ng, ligation_insert_volume, \
-    ligation_insert_amount
+    ligation_insert_amount, ligation_plan, MolarRatio, \
+    fit_standard_curve, quantify_dna
 from autoprotocol.unit import Unit
 import pytest
 
@@ -76,3 +77,85 @@ class TestBiocalculators:
             dna_mass_to_mole(100, 100)
         with pytest.raises(ValueError):
             dna_mass_to_mole(100, "12:uL")
+
+    def test_ligation_plan(self):
+        plan = ligation_plan(5000, [50, 500], plasmid_mass=Unit(100, "ng"),
+                             molar_ratio=["2:1", 1])
+        assert plan.insert_ng == [2.0, 10.0]
+        assert plan.insert_ul == [None, None]
+        assert plan.units["insert_ng"] == "nanogram"
+
+        plan = ligation_plan(200, 100, "66:ng", Unit(4, "uM"), 1.5)
+        assert "%.4f" % plan.insert_ul[0] == "%.4f" % ligation_insert_volume(
+            200, "66:ng", 100, Unit(4, "uM"), True, 1.5).magnitude
+
+        plan = ligation_plan(1, 1, plasmid_conc="1:uM", plasmid_volume="10:uL",
+                             insert_conc="2:ng/uL",
+                             ratio_sweep=["1:3", "3:5"])
+        assert plan.molar_ratio == [1 / 3.0, 0.6]
+        assert "%.2f" % plan.insert_ul[1] == "1.98"
+
+        with pytest.raises(ValueError):
+            ligation_plan(1000, [100, 200], "100:ng", molar_ratio=[1, 2, 3])
+        with pytest.raises(ValueError):
+            ligation_plan(1000, 100, "12:uL")
+        with pytest.raises(ValueError):
+            ligation_plan(1000, 100, "100:ng", molar_ratio="1-3")
+        with pytest.raises(ValueError):
+            ligation_plan(1000, 100, plasmid_conc="1:uM")
+
+    def test_molar_ratio(self):
+        ratio = MolarRatio("3:5")
+        assert MolarRatio("3:5") is ratio
+        assert MolarRatio(ratio) is ratio
+        assert ratio.value == 0.6
+        assert ratio == MolarRatio(0.6)
+        assert float(MolarRatio(2)) == 2.0
+        assert "1.98:microliter" == str(
+            ligation_insert_amount(1, "1:uM", "10:uL", 1, "2:ng/uL",
+                                   True, ratio))
+        assert "2.0:nanogram" == str(
+            ligation_insert_ng(5000, Unit(100, "ng"), 50, MolarRatio("2:1")))
+        plan = ligation_plan(5000, 50, "100:ng", molar_ratio=MolarRatio(2))
+        assert plan.insert_ng == [2.0]
+        with pytest.raises(AttributeError):
+            ratio.value = 1
+        for bad in ["1:3:4", "a:b", "1:0", -1, None, True]:
+            with pytest.raises(ValueError):
+                MolarRatio(bad)
+
+    def test_unit_validation(self):
+        with pytest.raises(ValueError) as e:
+            dna_mass_to_mole(100, mass="12:uL")
+        assert str(e.value) == "Mass of DNA must be of type Unit in prefix-gram"
+        assert "0.1:picomole" == str(dna_mass_to_mole(length=10, mass="660:pg"))
+        with pytest.raises(ValueError) as e:
+            ligation_insert_volume(20, "12:uL", 10, Unit(33, "uM"))
+        assert "Plasmid mass" in str(e.value)
+        with pytest.raises(ValueError) as e:
+            ligation_insert_amount(1, "1:uM", "10:uL", 1, "2:ng")
+        assert str(e.value) == "Concentration must be of type string or Unit "
+
+    def test_quantify_dna(self):
+        curve = fit_standard_curve([0, 0.5, 1, 2], [10, 510, 1010, 2010])
+        assert curve.slope == 1000.0
+        assert curve.intercept == 10.0
+        assert curve.r_squared == 1.0
+        quant = quantify_dna({0: 340, 5: 1660}, curve, 5000,
+                             dilution_factor=100)
+        assert quant[0].mass_conc == 33.0
+        assert quant[5].molar == 50.0
+        assert str(mass_conc_to_molar(5000, "165:ng/uL")) == \
+            "0.05:micromolar"
+        quant = quantify_dna([10, None, 3310], curve, [10, 1, 10], ds=False)
+        assert sorted(quant.keys()) == [0, 2]
+        assert quant[0].mass_conc == 0
+        assert round(quant[2].molar, 6) == 1000.0
+        with pytest.raises(ValueError):
+            fit_standard_curve([1], [10])
+        with pytest.raises(ValueError):
+            fit_standard_curve([1, 1], [10, 20])
+        with pytest.raises(ValueError):
+            quantify_dna([10], (1, 0, 1), 100)
+        with pytest.raises(ValueError):
+            quantify_dna([10], curve, 100, ds="ds")
@@ -1,17 +1,26 @@
+import copy
+import json
+import pickle
 import pytest
+import sys
+import threading
 from random import sample
-from autoprotocol import Protocol
+from autoprotocol import Protocol, UserError
 from autoprotocol.container import Well, WellGroup, Container
 from autoprotocol.unit import Unit
 from autoprotocol_utilities.container_helpers import list_of_filled_wells, \
     first_empty_well, unique_containers, sort_well_group, stamp_shape, \
     is_columnwise, plates_needed, volume_check, set_pipettable_volume, well_name, \
-    container_type_checker, get_well_list_by_cont, next_wells
+    container_type_checker, get_well_list_by_cont, next_wells, \
+    normalization_plan, serial_dilution_plan, VolumeLedger, _container_info, \
+    pack_plates, BlockPlacement, well_mask
 from autoprotocol_utilities.misc_helpers import make_list, flatten_list, \
     char_limit, det_new_group, recursive_search, transfer_properties, \
-    user_errors_group
+    PropertyColumns, SharedProperties, user_errors_group, container_lock, \
+    ErrorCollector, sanitize_labels, unshare_properties
+from autoprotocol_utilities.well_set import WellSet
 from autoprotocol_utilities.magnetic_helpers import get_mag_frequency, \
-    get_mag_amplicenter
+    get_mag_amplicenter, MaxVolumeTracker
 
 
 class TestContainerfunctions:
@@ -53,6 +62,55 @@ class TestContainerfunctions:
         assert not first_empty_well(self.c)
         assert not first_empty_well(self.ws)
 
+    def test_well_set(self):
+        plate = self.p.ref("well_set_plate", id=None, cont_type="96-flat",
+                           discard=True)
+        samples = WellSet.from_wells(plate.wells_from(0, 24))
+        controls = WellSet(plate, range(20, 30))
+        assert len(samples) == 24
+        assert (samples - controls).to_rle() == "0-19"
+        assert (samples | controls).to_rle() == "0-29"
+        assert (samples ^ controls).to_rle() == "0-19,24-29"
+        assert list((samples & controls).wells()) == \
+            list(plate.wells_from(20, 4))
+        assert plate.well(3) in samples
+        assert 25 not in samples
+        sparse = WellSet(plate, [0, 2, 3, 4, 95])
+        assert sparse.to_rle() == "0,2-4,95"
+        assert WellSet.from_rle(plate, sparse.to_rle()) == sparse
+        assert sparse.indices() == [0, 2, 3, 4, 95]
+        assert not WellSet(plate)
+        assert WellSet(plate).to_rle() == ""
+        with pytest.raises(Exception):
+            WellSet(plate, [96])
+        with pytest.raises(Exception):
+            WellSet(plate, self.c.wells_from(0, 2))
+        with pytest.raises(Exception):
+            samples | WellSet(self.c, [0])
+
+    def test_well_mask(self):
+        plate = self.p.ref("masked_plate", id=None, cont_type="96-flat",
+                           discard=True)
+        mask = well_mask(plate, edges=True)
+        assert mask is well_mask("96-flat", edges=True)
+        assert bin(mask).count("1") == 36
+        assert well_mask(plate, columns=[0], wells=[1]) == \
+            well_mask(plate, wells=[0, 1, 12, 24, 36, 48, 60, 72, 84])
+        plate.wells_from(0, 20).set_volume("10:microliter")
+        assert len(list_of_filled_wells(plate, exclude=mask)) == 7
+        assert len(list_of_filled_wells(plate, empty=True,
+                                        exclude=[95])) == 75
+        assert first_empty_well(plate, exclude=mask) == 20
+        assert first_empty_well(plate, exclude=well_mask(
+            plate, wells=range(20, 96))) is None
+        group = next(next_wells(plate, num=8, exclude=mask))
+        assert [w.index for w in group] == [13, 14, 15, 16, 17, 18, 19, 20]
+        group = next(next_wells(plate, num=6, columnwise=True, exclude=mask))
+        assert [w.index for w in group] == [13, 25, 37, 49, 61, 73]
+        assert len(list(next_wells([plate, plate], 12, exclude=mask))) == 10
+        with pytest.raises(ValueError):
+            well_mask("96-round")
+
     def test_unique_containers(self):
         wells = self.ws[:]
         assert len(unique_containers(wells)) == 1
@@ -102,7 +160,15 @@ class TestContainerfunctions:
          [None, {"rows": 0, "columns": 0}, []],
          [None, {"rows": 0, "columns": 0}, []],
          [c2.well(24), {"rows": 1, "columns": 12}, []],
-         [c2.well(25), {"rows": 1, "columns": 12}, []]])
+         [c2.well(25), {"rows": 1, "columns": 12}, []]]),
+        (WellSet(c2, range(24, 48)), True, True, [
+         [None, {"rows": 0, "columns": 0}, []],
+         [None, {"rows": 0, "columns": 0}, []],
+         [c2.well(24), {"rows": 1, "columns": 12}, []],
+         [c2.well(25), {"rows": 1, "columns": 12}, []]]),
+        (WellSet(c, range(0, 24)), True, False, [c.well(0),
+                                                 {"rows": 2, "columns": 12},
+                                                 []])
     ])
     def test_stamp_shape(self, wells, full, quad, r):
         res = stamp_shape(wells, full, quad)
@@ -144,6 +210,27 @@ class TestContainerfunctions:
         assert plates_needed(350, self.c2) == 1
         assert plates_needed(234, "384-flat") == 1
 
+    def test_pack_plates(self):
+        layout = pack_plates([(8, 6), (8, 6), (8, 6), 10],
+                             ["96-flat", "384-flat"], reserved=[95])
+        assert layout.container_type == "384-flat"
+        assert layout.plates == 1
+        layout = pack_plates([(8, 6), (8, 6), (8, 6), 10], "96-flat",
+                             reserved=[95])
+        assert layout.plates == 3
+        assert [b.plate for b in layout.layout[:3]] == [0, 1, 2]
+        assert layout.layout[3] == [BlockPlacement(
+            0, [6, 7, 8, 9, 10, 11, 18, 19, 20, 21])]
+        layout = pack_plates([70, (2, 2)], "96-flat", exclude_edges=True)
+        assert layout.layout[1] == BlockPlacement(0, [13, 14, 25, 26])
+        assert [len(b.wells) for b in layout.layout[0]] == [56, 14]
+        assert 0 not in layout.layout[0][0].wells
+        assert layout.plates == 2
+        with pytest.raises(ValueError):
+            pack_plates([(9, 1)], "96-flat")
+        with pytest.raises(ValueError):
+            pack_plates([1], "96-round")
+
     def test_set_pipettable_volume(self):
         old_vol = Unit(20, "microliter")
         new_well = set_pipettable_volume(self.c.well(95))
@@ -183,6 +270,17 @@ class TestContainerfunctions:
                             use_safe_dead_diff=True) is None
         assert volume_check(self.c.well(25), 0,
                             use_safe_vol=True) is not None
+        assert volume_check(self.c.wells_from(0, 2), "1:microliter") is None
+        assert volume_check(self.c.well(0), "18:microliter") is not None
+
+    def test_container_info(self):
+        info = _container_info(self.c2)
+        assert info is _container_info("384-echo")
+        assert (info.well_count, info.rows, info.cols) == (384, 16, 24)
+        assert isinstance(info.dead_volume_ul, float)
+        assert info.dead_volume_ul == float(
+            self.c2.container_type.dead_volume_ul.magnitude)
+        assert _container_info("not-a-plate") is None
 
     def test_well_name(self):
         assert well_name(self.c.well(0)) == "testplate_pcr-0"
@@ -216,6 +314,36 @@ class TestContainerfunctions:
 
     def test_user_errors_group(self):
         assert user_errors_group([None]) is None
+        with pytest.raises(UserError) as e:
+            user_errors_group(["a", None, "b", "a"])
+        assert str(e.value) == ("3 error(s) found in this protocol: "
+                                "<Error 1> a (2 times) <Error 2> b")
+        with pytest.raises(UserError) as e:
+            user_errors_group(["e%s" % i for i in range(1000)], limit=2)
+        assert str(e.value).endswith("<Error 2> e1 <Error 3> 998 more "
+                                     "error(s)")
+
+    def test_error_collector(self):
+        errors = ErrorCollector(limit=2, max_groups=2)
+        errors.raise_errors()
+        for well in self.c.all_wells():
+            errors.add("%s is empty" % well.humanize(), "dead volume", self.c)
+            errors.add("same", "dead volume", self.c2)
+        errors.add(None, "other")
+        errors.add("x", "other")
+        assert len(errors) == 193
+        assert errors.counts() == {("dead volume", self.c): 96,
+                                   ("dead volume", self.c2): 96,
+                                   ("other", None): 1}
+        assert errors.errors[1] == ("dead volume", "same", self.c2)
+        with pytest.raises(UserError) as e:
+            errors.raise_errors()
+        assert e.value.info is errors
+        assert str(e.value) == (
+            "193 error(s) found in this protocol: <Error 1> A1 is empty "
+            "<Error 2> A2 is empty <Error 3> 94 more dead volume error(s) in "
+            "%s <Error 4> same (96 times) <Error 5> 1 more error(s) in 1 "
+            "other group(s)" % self.c)
 
     def test_well_generator(self):
         assay_wells = next_wells(self.c, num=8, columnwise=True)
@@ -232,6 +360,86 @@ class TestContainerfunctions:
             well_matrix2.append(assay_wells2)
         assert len(well_matrix2) == 12
 
+    def test_serial_dilution_plan(self):
+        plate = self.p.ref("serial_dil", id=None, cont_type="96-flat",
+                           discard=True)
+        plan = serial_dilution_plan(plate, 8, 12, 3, "100:microliter")
+        assert plan.errors == []
+        assert plan.columnwise is False
+        assert plan.series[1][0] == plate.well(12)
+        assert plan.transfer_volume == [50.0] * 8
+        assert plan.stock_volume == [150.0] * 8
+        assert len(plan.transfers) == 11
+        assert plan.transfers[0][0].source == plate.well(0)
+        assert plan.transfers[0][0].destination == plate.well(1)
+        stock = self.p.ref("serial_stock", id=None, cont_type="96-pcr",
+                           discard=True)
+        stock.wells_from(0, 2).set_volume("100:microliter")
+        plan = serial_dilution_plan(plate, 2, 8, [2, 11], 50,
+                                    columnwise=True,
+                                    sources=stock.wells_from(0, 2))
+        assert plan.series[0][1] == plate.well(12)
+        assert plan.stock_volume == [100.0, 55.0]
+        assert len(plan.transfers) == 8
+        assert len(plan.errors) == 1
+        plan = serial_dilution_plan(plate, 13, 8, 2, 50, columnwise=True)
+        assert len(plan.series) == 12
+        assert len(plan.errors) == 1
+        with pytest.raises(Exception):
+            serial_dilution_plan(plate, 2, 8, 1, 50)
+
+    def test_volume_ledger(self):
+        src = self.p.ref("ledger_src", id=None, cont_type="96-pcr",
+                         discard=True)
+        dest = self.p.ref("ledger_dest", id=None, cont_type="96-pcr",
+                          discard=True)
+        src.well(0).set_volume("27:microliter")
+        ledger = VolumeLedger()
+        for well in dest.wells_from(0, 8):
+            ledger.add(src.well(0), well, "4:microliter")
+        assert len(ledger) == 8
+        assert ledger.replay() == {
+            src.well(0): (5, 6)}
+        assert src.well(0).volume == Unit(27, "microliter")
+        ledger = VolumeLedger()
+        ledger.add(None, src.well(1), 10)
+        ledger.extend([(src.well(1), dest.well(0), 4),
+                       (dest.well(0), None, Unit(2, "microliter")),
+                       (src.well(1), dest.well(1), 3)])
+        shortfall = ledger.replay()
+        assert shortfall[src.well(1)].safe_min_volume == 3
+        assert shortfall[src.well(1)].dead_volume is None
+        assert shortfall[dest.well(0)].dead_volume == 2
+        assert ledger.volumes()[dest.well(1)] == 3.0
+        assert src.well(1).volume is None
+
+    def test_normalization_plan(self):
+        src = self.p.ref("norm_src", id=None, cont_type="96-pcr",
+                         discard=True)
+        dest = self.p.ref("norm_dest", id=None, cont_type="96-pcr",
+                          discard=True)
+        src.wells_from(0, 4).set_volume("30:microliter")
+        plan = normalization_plan(src.wells_from(0, 3), [50, 20, 10],
+                                  "10:nanomolar", "20:microliter",
+                                  dest.wells_from(0, 3))
+        assert plan.errors == []
+        assert [t.volume for t in plan.sample] == [4.0, 10.0, 20.0]
+        assert [(t.destination.index, t.volume) for t in plan.diluent] == \
+            [(0, 16.0), (1, 10.0)]
+        plan = normalization_plan(src.wells(0, 1, 2, 3),
+                                  {0: "0.05:micromolar", 1: 5, 2: 1000,
+                                   3: 20},
+                                  Unit(10, "nanomolar"), 20,
+                                  dest.wells_from(0, 4), min_volume=1)
+        assert [t.volume for t in plan.sample] == [4.0, 10.0]
+        assert len(plan.errors) == 2
+        plan = normalization_plan(src.wells(0, 0), [10, 10], 10, 15,
+                                  dest.wells_from(0, 2))
+        assert len(plan.errors) == 1
+        with pytest.raises(Exception):
+            normalization_plan(src.wells_from(0, 2), [10, 10], 10, 15,
+                               dest.wells_from(0, 3))
+
 
 class TestDataformattingfunctions:
 
@@ -273,6 +481,47 @@ class TestDataformattingfunctions:
         else:
             assert r[1] in res.error_message
 
+    @pytest.mark.parametrize("labels, kwargs, r, changed, too_long", [
+        (["abc", "abcdef"], {"length": 4}, ["abc", "abcdef"], [], [1]),
+        (["abc", "abcdef"], {"length": 4, "trunc": True},
+         ["abc", "abcd"], [1], []),
+        (["abc", "abcdef"], {"length": 4, "clip": True},
+         ["abc", "cdef"], [1], []),
+        (["s", "s", "s_2", "s"], {"unique": True},
+         ["s", "s_3", "s_2", "s_4"], [1, 3], []),
+        (["abcdef"] * 3, {"length": 5, "trunc": True, "unique": True},
+         ["abcde", "abc_2", "abc_3"], [0, 1, 2], []),
+        (["abcdef"] * 2, {"length": 6, "clip": True, "unique": True,
+                          "separator": "-"},
+         ["abcdef", "cdef-2"], [1], []),
+        (["abc"] * 2, {"length": 3, "unique": True},
+         ["abc", "abc_2"], [1], [1]),
+        (["ab"] * 2, {"length": 1, "trunc": True, "unique": True},
+         ["a", "_2"], [0, 1], [1])
+    ])
+    def test_sanitize_labels(self, labels, kwargs, r, changed, too_long):
+        res = sanitize_labels(labels, **kwargs)
+        assert res.labels == r
+        assert list(res) == r
+        assert res.changed == changed
+        assert res.too_long == too_long
+        assert bool(res) == (not too_long)
+        assert res.error_messages() == [
+            char_limit(r[i], kwargs.get("length", 22)).error_message
+            for i in too_long]
+
+    def test_sanitize_labels_bulk(self):
+        labels = ["sample_%s" % (i % 500) for i in range(5000)]
+        res = sanitize_labels(labels, length=12, trunc=True, unique=True)
+        assert len(set(res)) == 5000
+        assert max(len(label) for label in res) <= 12
+        assert res[0] == "sample_0" and res[500] == "sample_0_2"
+        errors = ErrorCollector()
+        sanitize_labels(labels[:3], length=3).add_errors(errors)
+        assert errors.counts() == {("label length", None): 3}
+        with pytest.raises(AssertionError):
+            sanitize_labels(["a", 1])
+
 
 class TestRecursiveParams:
     protocol = Protocol()
@@ -338,6 +587,193 @@ class TestPropertyFunctions:
         res = transfer_properties(src_well, dest_well, prop)
         assert len(res) == r
 
+    def test_transfer_properties_bulk(self):
+        p = Protocol()
+        src = p.ref("bulk_src", id=None, cont_type="96-pcr", discard=True)
+        dest = p.ref("bulk_dest", id=None, cont_type="96-pcr", discard=True)
+        for well in src.all_wells():
+            well.set_properties({"sample": well.index % 3, "tag": "x"})
+        dest.well(0).set_properties({"old": 1})
+        calls = []
+
+        def rename(value, prefix):
+            calls.append(value)
+            return prefix + str(value)
+
+        res = transfer_properties(
+            src.all_wells(), dest.all_wells(),
+            {"sample": rename, "tag": None}, {"sample": {"prefix": "s"}},
+            pset=True, memoize=True)
+        assert res is None
+        assert sorted(calls) == [0, 1, 2]
+        assert dest.well(0).properties == {"sample": "s0", "tag": "x"}
+        assert dest.well(95).properties == {"sample": "s2", "tag": "x"}
+
+        transfer_properties(src.all_wells(), dest.all_wells(),
+                            {"sample": lambda v: [v]}, memoize=True)
+        dest.well(0).properties["sample"].append(9)
+        assert dest.well(0).properties["sample"] == [0, 9]
+        assert dest.well(3).properties["sample"] == [0]
+
+    def test_transfer_properties_shared(self):
+        p = Protocol()
+        src = p.ref("share_src", id=None, cont_type="96-pcr", discard=True)
+        reps = [p.ref("share_rep_%s" % i, id=None, cont_type="96-pcr",
+                      discard=True) for i in range(3)]
+        for well in src.all_wells():
+            well.set_properties({"sample": "s%s" % well.index})
+        for rep in reps[:2]:
+            transfer_properties(src.all_wells(), rep.all_wells(),
+                                pset=True, share=True)
+        shared = reps[0].well(4).properties
+        assert isinstance(shared, SharedProperties)
+        assert reps[1].well(4).properties is shared
+        assert type(src.well(4)) is Well
+        assert type(src.well(4).properties) is dict
+        src.well(4).properties["y"] = 2
+        src.well(7).set_properties({"a": "p", "b": "q"})
+        transfer_properties(src.all_wells(), reps[2].all_wells(),
+                            pset=True, share=True)
+        assert reps[2].well(4).properties == {"sample": "s4", "y": 2}
+        assert reps[2].well(5).properties is reps[0].well(5).properties
+        assert shared == {"sample": "s4"}
+        src.well(7).set_properties({"b": "p", "a": "q"})
+        transfer_properties(src.well(7), reps[1].well(7), pset=True,
+                            share=True)
+        assert reps[1].well(7).properties == {"a": "q", "b": "p"}
+        assert reps[2].well(7).properties == {"a": "p", "b": "q"}
+
+        with pytest.raises(TypeError):
+            reps[0].well(4).properties["sample"] = "x"
+        with pytest.raises(TypeError):
+            reps[0].well(4).add_properties({"sample": "x"})
+        unshare_properties(reps[0].wells_from(4, 2))
+        reps[0].well(4).add_properties({"sample": "x"})
+        assert reps[0].well(4).properties == {"sample": "x"}
+        assert type(reps[0].well(5).properties) is dict
+        assert reps[1].well(4).properties == {"sample": "s4"}
+        assert type(reps[1].well(4)) is Well
+        transfer_properties(reps[1].well(5), reps[1].well(6),
+                            {"sample": lambda v: v + "!"})
+        assert reps[1].well(6).properties == {"sample": "s5!"}
+        assert reps[0].well(6).properties == {"sample": "s6"}
+        assert json.loads(json.dumps(p.as_dict()))["outs"][
+            "share_rep_1"]["4"]["properties"] == {"sample": "s4"}
+        assert pickle.loads(pickle.dumps(shared)) == shared
+        well = copy.deepcopy(reps[1].well(4))
+        assert well.properties == shared
+        assert isinstance(well.properties, SharedProperties)
+
+        transfer_properties(src.wells_from(0, 4), reps[0].wells_from(0, 4),
+                            {"sample": lambda v: v[:1]}, pset=True,
+                            share=True)
+        assert reps[0].well(0).properties == {"sample": "s"}
+        assert reps[0].well(3).properties is reps[0].well(0).properties
+        transfer_properties(src.wells_from(0, 2), reps[0].wells_from(0, 2),
+                            {"sample": lambda v: [v]}, pset=True, share=True)
+        assert type(reps[0].well(0).properties) is dict
+        assert src.well(0).properties == {"sample": "s0"}
+
+    def test_property_columns(self):
+        p = Protocol()
+        src = p.ref("col_src", id=None, cont_type="96-pcr", discard=True)
+        dest = p.ref("col_dest", id=None, cont_type="96-pcr", discard=True)
+        for well in src.wells_from(0, 10):
+            well.set_properties({"sample": "s%s" % (well.index % 2)})
+        src.well(1).add_properties({"note": "a"})
+        columns = PropertyColumns.from_container(src)
+        assert sorted(columns.columns) == ["note", "sample"]
+        assert columns.columns["sample"][10] is None
+        columns.copy(dest).transform("sample", lambda s: s.upper()).apply()
+        assert dest.well(1).properties == {"sample": "S1", "note": "a"}
+        assert dest.well(10).properties == {}
+        assert src.well(1).properties["sample"] == "s1"
+        counter = iter(range(100))
+        columns = PropertyColumns.from_container(src)
+        columns.transform("sample", lambda s: next(counter))
+        assert columns.columns["sample"][:11] == list(range(10)) + [None]
+        columns = PropertyColumns.from_container(src)
+        columns.transform("sample", lambda s: next(counter), memoize=True)
+        assert columns.columns["sample"][:4] == [10, 11, 10, 11]
+        only = PropertyColumns.from_container(src, ["note"])
+        assert list(only.columns) == ["note"]
+        with pytest.raises(AssertionError):
+            only.copy(p.ref("col_384", id=None, cont_type="384-echo",
+                            discard=True))
+
+
+class TestThreadSafety:
+
+    def test_concurrent_helpers(self):
+        """Correctness under thread contention, not throughput.
+
+        The helpers are pure Python, so under the GIL threads building
+        protocols take turns instead of running in parallel and a scaling
+        check against a serial run would only measure scheduler noise.
+        With a tiny switch interval to force interleaving, this checks
+        that concurrent updates to a shared plate are not lost and that
+        copies get exactly their own properties.
+        """
+        p = Protocol()
+        plate = p.ref("shared_plate", id=None, cont_type="96-deep",
+                      discard=True)
+        plate.all_wells().set_volume("2000:microliter")
+        for well in plate.all_wells():
+            well.set_properties({"n": well.index})
+        copies = [p.ref("copy_%s" % i, id=None, cont_type="96-pcr",
+                        discard=True) for i in range(8)]
+        errors = []
+
+        def shift(value, offset):
+            return value + offset
+
+        def work(i):
+            try:
+                for _ in range(10):
+                    set_pipettable_volume(plate.wells_from(0, 96))
+                    transfer_properties(
+                        plate.all_wells(), copies[i].all_wells(),
+                        {"n": shift}, {"n": {"offset": i}})
+                    assert recursive_search(
+                        [plate.well(0)], Well, volume_check,
+                        {"usage_volume": 1}) == []
+            except Exception as e:
+                errors.append(e)
+
+        switch = getattr(sys, "getswitchinterval", None)
+        if switch:
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work, args=(i,))
+                       for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            if switch:
+                sys.setswitchinterval(interval)
+
+        assert errors == []
+        dead = plate.container_type.dead_volume_ul
+        expected = Unit(2000, "microliter") - dead * 80
+        assert all(w.volume == expected for w in plate.all_wells())
+        for i, cont in enumerate(copies):
+            assert [w.properties["n"] for w in cont.all_wells()] == \
+                list(range(i, 96 + i))
+        assert container_lock(plate) is container_lock(plate)
+        assert container_lock(plate) is not container_lock(copies[0])
+
+    def test_no_shared_defaults(self):
+        p = Protocol()
+        c = p.ref("defaults_plate", id=None, cont_type="96-pcr",
+                  discard=True)
+        c.well(0).set_properties({"a": 1})
+        transfer_properties(c.well(0), c.well(1))
+        assert transfer_properties.__defaults__[:2] == (None, None)
+        assert recursive_search.__defaults__[-1] is None
+
 
 class TestMagneticHelperFunctions:
     p = Protocol()
@@ -349,6 +785,23 @@ class TestMagneticHelperFunctions:
         assert resp["center"] == 0.25
         assert resp["amplitude"] == 0.25
 
+    def test_max_volume_tracker(self):
+        c = self.p.ref("testplate_tracker", id=None, cont_type="96-deep-kf",
+                       discard=True)
+        c.well(0).set_volume("100:microliter")
+        tracker = MaxVolumeTracker(c)
+        assert tracker.max_volume_ul == 100
+        tracker.set_volume(c.wells_from(1, 4), "500:microliter")
+        assert get_mag_amplicenter(tracker) == get_mag_amplicenter(c)
+        assert get_mag_amplicenter(tracker)["center"] == 0.25
+        tracker.add_volume(c.wells_from(1, 4), "-300:microliter")
+        assert tracker.max_volume_ul == 200
+        assert c.well(1).volume == Unit(200, "microliter")
+        tracker.add_volume(c.wells_from(1, 4), "-150:microliter")
+        assert tracker.max_volume_ul == 100
+        with pytest.raises(Exception):
+            tracker.set_volume(self.c.well(0), "10:microliter")
+
     def test_get_mag_frequency(self):
         assert get_mag_frequency(self.c, "fast") == "2.5:hertz"
         assert get_mag_frequency(self.c, "slow") == "0.15:hertz"
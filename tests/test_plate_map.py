@@ -0,0 +1,40 @@
+import pytest
+from autoprotocol import Protocol
+from autoprotocol_utilities.plate_map import render_plate_map, plate_map_rle
+from autoprotocol_utilities.rectangle import binary_list
+
+
+def test_render_plate_map():
+    plate_map = render_plate_map(0b1000000000111, (2, 12))
+    assert plate_map.splitlines() == [
+        "   1  2  3  4  5  6  7  8  9 10 11 12",
+        "A  #  #  #  .  .  .  .  .  .  .  .  .",
+        "B  #  .  .  .  .  .  .  .  .  .  .  ."]
+    assert render_plate_map([10, 20, 0, None, 5, 20], (2, 3),
+                            header=False) == " 5 9 .\n . 3 9"
+    assert render_plate_map([5, 40], (1, 2), scale=10,
+                            header=False) == " 5 9"
+    bnry = list(binary_list([0, 12], length=96))
+    assert render_plate_map(bnry, "96-flat", occupancy=True) == \
+        render_plate_map({0: 1, 12: 1}, "96-flat", occupancy=True) == \
+        render_plate_map(1 | 1 << 12, "96-flat")
+    assert render_plate_map([0.25, 1, 0.5], (1, 3),
+                            header=False) == " 3 9 5"
+    assert render_plate_map([0.25, 1, 0], (1, 3), header=False,
+                            occupancy=True) == " # # ."
+    p = Protocol()
+    plate = p.ref("plate", None, "384-flat", discard=True)
+    assert len(render_plate_map(0, plate).splitlines()) == 17
+    lines = render_plate_map(bytearray(1536), (32, 48)).splitlines()
+    assert lines[-1].startswith("AF  .")
+    with pytest.raises(ValueError):
+        render_plate_map(0, "96-round")
+    with pytest.raises(AssertionError):
+        render_plate_map([1, 2], (1, 2), scale=0)
+    assert render_plate_map([0, None], (1, 2), header=False) == " . ."
+
+
+def test_plate_map_rle():
+    assert plate_map_rle(0b1000000000111, "96-flat") == "1*3,0*9,1*1,0*83"
+    assert plate_map_rle([10, 10, None, 0, 5], (1, 5)) == "10*2,0*2,5*1"
+    assert plate_map_rle(bytearray(b"\x01" * 96), "96-pcr") == "1*96"
@@ -1,5 +1,7 @@
 import pytest
 from collections import namedtuple
+from autoprotocol import Protocol
+from autoprotocol_utilities.well_set import WellSet
 from autoprotocol_utilities.rectangle import area, area2rect, chop_list, binary_list, max_histogram_area, max_rectangle, \
     get_well_in_quadrant, get_quadrant_indices, get_quadrant_binary_list
 
@@ -101,6 +103,31 @@ def test_get_quadrant_binary_list(list, quad):
             (item in get_quadrant_binary_list(temp_list, [quad])[0]) is True)
 
 
+def test_binary_list_unsorted():
+    assert list(binary_list([6, 0, 2, 2, 1])) == [1, 1, 1, 0, 0, 0, 1]
+    assert list(binary_list([], length=4)) == [0, 0, 0, 0]
+    assert list(binary_list([0, 7], length=7)) == [1, 0, 0, 0, 0, 0, 0]
+    assert list(binary_list([-1, 3])) == [0, 0, 0, 1]
+    bnry = binary_list([1], length=2)
+    assert next(bnry) == 0 and next(bnry) == 1
+    assert chop_list(list(binary_list([1, 3], 5)), 3) == \
+        [[0, 1, 0], [1, 0, None]]
+    assert chop_list(bytearray([0, 1, 0, 1, 0]), 3, filler=0) == \
+        [bytearray([0, 1, 0]), [1, 0, 0]]
+
+
+def test_well_set_binary_lists():
+    p = Protocol()
+    plate = p.ref("plate", None, "384-flat", discard=True)
+    wells = WellSet(plate, [0, 2, 25])
+    assert list(binary_list(wells, 4)) == [1, 0, 1, 0]
+    assert list(binary_list(wells)) == \
+        list(binary_list([0, 2, 25], length=384))
+    quads = get_quadrant_binary_list(wells)
+    assert quads[0][:2] == [1, 1]
+    assert sum(quads[3]) == 1
+
+
 @pytest.mark.parametrize("quadwells, quad, actual_wells", [  # NOQA
     ([0, 1, 2, 3], 0, [0, 2, 4, 6]),
     ([0, 1, 2, 3], 1, [1, 3, 5, 7]),
@@ -1,5 +1,6 @@
+import json
 import pytest
-from autoprotocol_utilities.resource_helpers import ResourceIDs, oligo_scale_default, oligo_dilution_table, return_agar_plates, ref_kit_container  # NOQA
+from autoprotocol_utilities.resource_helpers import ResourceIDs, oligo_scale_default, oligo_scale_batch, oligo_dilution_table, oligo_dilution_volumes, return_agar_plates, ref_kit_container, ref_kit_containers, return_dispense_media, load_catalog, reagent_consumption  # NOQA
 from autoprotocol import Protocol, Container, ContainerType  # NOQA
 
 
@@ -12,6 +13,24 @@ def test_oligo_scale_default(length, scale, label, output):
     assert (oligo_scale_default(length, scale, label)[0] == output)
 
 
+def test_oligo_scale_default_unknown_scale():
+    res = oligo_scale_default(50, "5nm", "sample")
+    assert res.success is False
+    assert "5nm" in res.error_message
+
+
+def test_oligo_scale_batch():
+    res = oligo_scale_batch([50, 115, 4, 50], ["10nm", "100nm", "1um", "5nm"],
+                            ["a", "b", "c", "d"])
+    assert res.success == [True, False, False, False]
+    assert [f.index for f in res.failures] == [1, 2, 3]
+    assert res.failures[0].error_message == oligo_scale_default(
+        115, "100nm", "b").error_message
+    res = oligo_scale_batch([20, 80], "25nm")
+    assert res.success == [True, False]
+    assert res.failures[0].label == 1
+
+
 @pytest.mark.parametrize("conc, sc, dilution_table", [
     ("100uM", "10nm", 60),
     ("100uM", "100nm", 1000),
@@ -22,6 +41,26 @@ def test_oligo_dilution_table(conc, sc, dilution_table):
     assert (oligo_dilution_table(conc, sc) == dilution_table)
 
 
+def test_oligo_dilution_table_slices():
+    assert oligo_dilution_table(sc="25nm") == {"100uM": {"25nm": 250},
+                                               "1mM": {"25nm": 25}}
+    assert oligo_dilution_table(conc="1mM")["1um"] == 1000
+    assert len(oligo_dilution_table()["100uM"]) == 5
+    with pytest.raises(Exception):
+        oligo_dilution_table(conc="10uM")
+
+
+def test_oligo_dilution_volumes():
+    assert oligo_dilution_volumes(["10nm", "1um"]) == [60, 10000]
+    assert oligo_dilution_volumes(["10nm", "1um"], "1mM") == [6, 1000]
+    assert oligo_dilution_volumes(["25nm", "25nm"],
+                                  ["1mM", "50:micromolar"]) == [25, 500]
+    with pytest.raises(ValueError):
+        oligo_dilution_volumes(["25nm"], "50:nanogram/microliter")
+    with pytest.raises(Exception):
+        oligo_dilution_volumes(["5nm"])
+
+
 @pytest.mark.parametrize("wells, plates", [
     (6, {"lb_miller_50ug_ml_kan": "ki17rs7j799zc2",
          "lb_miller_100ug_ml_amp": "ki17sbb845ssx9",
@@ -38,6 +77,48 @@ def test_return_agar_plates(wells, plates):
     assert(return_agar_plates(wells) == plates)
 
 
+def test_ref_kit_containers():
+    p = Protocol()
+    plates = ref_kit_containers(p, 3, "6-flat", "lb_miller_50ug_ml_kan")
+    assert [c.name for c in plates] == ["lb_miller_50ug_ml_kan_0",
+                                        "lb_miller_50ug_ml_kan_1",
+                                        "lb_miller_50ug_ml_kan_2"]
+    assert p.refs["lb_miller_50ug_ml_kan_1"].opts == {
+        "reserve": "ki17rs7j799zc2", "discard": True}
+    plates = ref_kit_containers(p, ["a", "b"], "1-flat", "ki17t8jejbea4z",
+                                discard=False, store="cold_4")
+    assert plates[1].container_type.shortname == "1-flat"
+    assert plates[1].storage == "cold_4"
+    single = ref_kit_container(p, "c", "1-flat", "ki17t8jejbea4z",
+                               discard=False, store="cold_4")
+    assert p.refs["b"].opts == p.refs["c"].opts
+    assert single.storage == plates[1].storage
+    with pytest.raises(Exception):
+        ref_kit_containers(p, ["a"], "6-flat", "ki17rs7j799zc2")
+    with pytest.raises(Exception):
+        ref_kit_containers(p, ["d", "d"], "6-flat", "ki17rs7j799zc2")
+
+
+def test_reagent_consumption():
+    p = Protocol()
+    plate = p.ref("plate", None, "96-flat", discard=True)
+    water = ResourceIDs().water
+    p.provision(water, plate.wells_from(0, 10), "100:microliter")
+    p.dispense_full_plate(plate, water, "10:microliter",
+                          is_resource_id=True)
+    p.dispense(plate, "lb", [{"column": 0, "volume": "5:microliter"}])
+    usage = reagent_consumption(p)
+    assert usage[0] == (water, "water", 1960.0, 2, 30.0, 1990.0)
+    assert usage[1].resource_id == "lb"
+    assert usage[1].name is None
+    assert usage[1].volume == 40.0
+    usage = reagent_consumption(p.instructions, {"lb": "96-deep"})
+    assert usage[1].total == usage[1].volume + usage[1].dead_volume
+    assert usage[0].containers == 2
+    with pytest.raises(Exception):
+        reagent_consumption(p, "tube")
+
+
 class TestResources:
     _res = ResourceIDs()
 
@@ -75,3 +156,72 @@ class TestResources:
         result = self._res.restriction_enzyme_buffers("dpni_neb")
         assert result.enzyme_id == "rs18kfcmf5xvxz"
         assert result.buffer_id == "rs17ta93g3y85t"
+
+        result = self._res.restriction_enzyme_buffers("esp3i")
+        assert result.buffer_id == "rs18a8uvv7us8t"
+        assert result.errors is None
+
+    def test_resource_name(self):
+        assert self._res.resource_name("rs17gmh5wafm5p") == "water"
+        assert self._res.resource_name(self._res.dpni_neb) == "dpni_neb"
+        assert self._res.resource_name("nothing") is None
+
+    def test_registry(self):
+        assert ResourceIDs() is self._res
+        with pytest.raises(AttributeError):
+            self._res.water = "rs_not_water"
+
+
+class TestCatalog:
+
+    def write_catalog(self, tmpdir, catalog):
+        path = tmpdir.join("catalog.json")
+        path.write(json.dumps(catalog))
+        return str(path)
+
+    def test_default_catalog(self):
+        catalog = load_catalog()
+        assert catalog.version == 1
+        assert catalog.resource_ids["water"] == ResourceIDs().water
+        assert catalog.agar_plates[6] == return_agar_plates(6)
+        assert catalog.dispense_media == return_dispense_media()
+
+    def test_site_catalog(self, tmpdir):
+        path = self.write_catalog(tmpdir, {
+            "version": 1,
+            "resource_ids": {"water": "rs_site_water",
+                             "site_buffer": "rs_site_buffer"},
+            "agar_plates": {"6": {"lb_miller_noAB": "ki_site_plate"},
+                            "12": {"lb_miller_noAB": "ki_site_plate_12"}}})
+        try:
+            load_catalog(path)
+            res = ResourceIDs()
+            assert res.water == "rs_site_water"
+            assert res.site_buffer == "rs_site_buffer"
+            assert res.te == "rs17pwyc754v9t"
+            assert res.resource_name("rs_site_water") == "water"
+            assert res.diluents("water") == "rs_site_water"
+            assert return_agar_plates(6)["lb_miller_noAB"] == "ki_site_plate"
+            assert return_agar_plates(6)["lb_miller_100ug_ml_amp"] == \
+                "ki17sbb845ssx9"
+            assert return_agar_plates(12) == {
+                "lb_miller_noAB": "ki_site_plate_12"}
+        finally:
+            load_catalog()
+        assert ResourceIDs().water == "rs17gmh5wafm5p"
+        assert not hasattr(ResourceIDs(), "site_buffer")
+        with pytest.raises(ValueError):
+            return_agar_plates(12)
+
+    @pytest.mark.parametrize("catalog", [
+        {"version": 2},
+        {"version": 1, "resource_ids": {"water": 1}},
+        {"version": 1, "resource_ids": {"bacteria": "rs_bacteria"}},
+        {"version": 1, "agar_plates": {"six": {}}},
+        {"version": 1, "unknown": {}}
+    ])
+    def test_invalid_catalog(self, tmpdir, catalog):
+        path = self.write_catalog(tmpdir, catalog)
+        with pytest.raises(ValueError):
+            load_catalog(path)
+        load_catalog()